@@ -1,7 +1,16 @@
+import functools
+from collections import namedtuple
 import streamlit as st
 import utils
-import time
-from config import STAGES, STAGE_QUESTIONS, WELCOME_MESSAGE
+from config import (
+    Stage,
+    STAGE_QUESTIONS,
+    STAGE_NAMES,
+    STAGE_NAMES_WITH_ICONS,
+    STAGE_HINTS,
+    load_strings,
+    ASCII_LANG_DETECT_MIN_LENGTH
+)
 
 # Configure Streamlit page - MUST be first Streamlit command
 st.set_page_config(
@@ -21,7 +30,6 @@ except ImportError:
 
 # Import advanced modules with compatibility handling
 try:
-    from sentiment_analyzer import sentiment_analyzer
     from multilingual_support import multilingual_manager
     from personalization import personalization_manager, UserPreferences
     from enhanced_ui import enhanced_ui
@@ -37,12 +45,12 @@ except ImportError as e:
 def initialize_session_state():
     """Initialize session state variables with advanced features."""
     if 'stage' not in st.session_state:
-        st.session_state.stage = STAGES['NAME']
+        st.session_state.stage = Stage.NAME
     if 'candidate_info' not in st.session_state:
         st.session_state.candidate_info = {}
     if 'messages' not in st.session_state:
         st.session_state.messages = []
-        st.session_state.messages.append({"role": "assistant", "content": WELCOME_MESSAGE})
+        st.session_state.messages.append({"role": "assistant", "content": load_strings()['WELCOME_MESSAGE']})
     if 'conversation_started' not in st.session_state:
         st.session_state.conversation_started = False
     if 'error_count' not in st.session_state:
@@ -51,9 +59,12 @@ def initialize_session_state():
     # Advanced features initialization
     if ADVANCED_FEATURES_AVAILABLE:
         if 'sentiment_history' not in st.session_state:
-            st.session_state.sentiment_history = []
+            # A SentimentHistory is created with the first analysed reply
+            st.session_state.sentiment_history = None
         if 'user_language' not in st.session_state:
             st.session_state.user_language = 'en'
+        if 'lang_locked' not in st.session_state:
+            st.session_state.lang_locked = False
         if 'user_preferences' not in st.session_state:
             st.session_state.user_preferences = UserPreferences()
         if 'user_id' not in st.session_state:
@@ -61,6 +72,7 @@ def initialize_session_state():
         if 'conversation_metrics' not in st.session_state:
             st.session_state.conversation_metrics = {
                 'message_count': 0,
+                'sum_polarity': 0.0,
                 'avg_sentiment': 0.0,
                 'completion_rate': 0.0
             }
@@ -68,135 +80,180 @@ def initialize_session_state():
         # Initialize performance optimizer
         performance_optimizer.optimize_streamlit_performance()
 
+StageView = namedtuple('StageView', ['name', 'icon_name', 'progress', 'step', 'hint'])
+TOTAL_STAGES = len(Stage) - 1  # Exclude conclusion stage
+
+@functools.lru_cache(maxsize=16)
+def stage_view(stage: int) -> StageView:
+    """Derive display name, progress, step number and hint for a stage."""
+    return StageView(
+        name=STAGE_NAMES[stage],
+        icon_name=STAGE_NAMES_WITH_ICONS[stage],
+        progress=min(stage / TOTAL_STAGES, 1.0),
+        step=min(stage + 1, TOTAL_STAGES),
+        hint=STAGE_HINTS.get(stage, "")
+    )
+
+@functools.lru_cache(maxsize=None)
+def _sentiment_analyzer():
+    """Import the sentiment analyzer on first use; it is only needed once the user has replied."""
+    from sentiment_analyzer import sentiment_analyzer
+    return sentiment_analyzer
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _format_chat_message(role: str, content: str, language: str, emoji: str = "") -> str:
+    """Format a chat message for display; st.cache_data outlives reruns of this script, so earlier messages hit the cache."""
+    if emoji:
+        return f"{emoji} {content}"
+    if role == "assistant":
+        return multilingual_manager.format_message_with_language(content, language)
+    return content
+
+def _parse_email(text: str):
+    """Return the stripped email, or None if it is invalid."""
+    return text.strip() if utils.validate_email(text) else None
+
+def _parse_phone(text: str):
+    """Return the stripped phone number, or None if it is invalid."""
+    return text.strip() if utils.validate_phone(text) else None
+
+def _parse_experience(text: str):
+    """Return years of experience, or None if it is not a number."""
+    is_valid, years = utils.validate_experience(text)
+    return years if is_valid else None
+
+def _parse_tech_stack(text: str):
+    """Return the parsed tech stack, or None if it is empty."""
+    return utils.parse_tech_stack(text) or None
+
+# Stage -> (candidate field, parser returning None on failure, next stage,
+#           message on error, message after repeated errors)
+STAGE_VALIDATORS = {
+    Stage.EMAIL: (
+        'email', _parse_email, Stage.PHONE,
+        "Please provide a valid email address (e.g., john.doe@email.com).",
+        "I'm having trouble with the email format. Please provide a valid email address like: example@company.com"
+    ),
+    Stage.PHONE: (
+        'phone', _parse_phone, Stage.EXPERIENCE,
+        "Please provide a valid phone number (e.g., +1234567890 or 1234567890).",
+        "Please provide a valid phone number with 10-15 digits. You can include country code if needed (e.g., +1234567890)."
+    ),
+    Stage.EXPERIENCE: (
+        'experience', _parse_experience, Stage.POSITION,
+        "Please provide your experience in years as a number (e.g., 5, 2.5, or 0 for entry level).",
+        "Please provide your experience as a number (e.g., '3' for 3 years, '2.5' for 2.5 years, or '0' for entry level)."
+    ),
+    Stage.TECH_STACK: (
+        'tech_stack', _parse_tech_stack, Stage.TECHNICAL_QUESTIONS,
+        "Please provide at least one technology you're proficient in (e.g., Python, JavaScript, React).",
+        "Please list at least one technology you know. For example: 'Python, JavaScript' or 'React, Node.js, MongoDB'."
+    )
+}
+
 def process_user_input(user_input: str) -> str:
     """Process user input with advanced features including sentiment analysis and multilingual support."""
+    ss = st.session_state
+    # Lowercased once and shared by the sentiment fallback and the exit check
+    user_input_lower = user_input.lower()
     # Advanced features processing
     if ADVANCED_FEATURES_AVAILABLE:
-        # Detect language if not set
-        if st.session_state.user_language == 'en' and len(user_input) > 10:
+        # Detect language until a non-English language has been locked in;
+        # short ASCII-only messages are overwhelmingly English, so skip those
+        if (ss.user_language == 'en' and not ss.lang_locked
+                and len(user_input) > 10
+                and (not user_input.isascii() or len(user_input) >= ASCII_LANG_DETECT_MIN_LENGTH)):
             detected_lang = multilingual_manager.detect_language(user_input)
             if detected_lang != 'en':
-                st.session_state.user_language = detected_lang
+                ss.user_language = detected_lang
+                ss.lang_locked = True
                 st.sidebar.success(f"Language detected: {multilingual_manager.supported_languages[detected_lang].flag} {multilingual_manager.supported_languages[detected_lang].name}")
 
         # Analyze sentiment
-        sentiment_result = sentiment_analyzer.analyze_sentiment(user_input)
-        st.session_state.sentiment_history.append(sentiment_result)
-
-        # Update conversation metrics
-        st.session_state.conversation_metrics['message_count'] += 1
-        avg_sentiment = sum(s.polarity for s in st.session_state.sentiment_history) / len(st.session_state.sentiment_history)
-        st.session_state.conversation_metrics['avg_sentiment'] = avg_sentiment
+        sentiment_result = _sentiment_analyzer().analyze_sentiment(user_input, user_input_lower)
+        if ss.sentiment_history is None:
+            from sentiment_analyzer import SentimentHistory
+            ss.sentiment_history = SentimentHistory()
+        ss.sentiment_history.append(sentiment_result)
+
+        # Update conversation metrics with a running mean
+        metrics = ss.conversation_metrics
+        metrics['message_count'] += 1
+        metrics['sum_polarity'] += sentiment_result.polarity
+        metrics['avg_sentiment'] = metrics['sum_polarity'] / metrics['message_count']
 
     # Handle exit commands
     exit_message = "Thank you for your time! We appreciate you taking the time to speak with us. Our team will review your information and get back to you soon. Have a great day! 👋"
     if ADVANCED_FEATURES_AVAILABLE:
-        exit_message = multilingual_manager.get_translation('goodbye', st.session_state.user_language)
+        exit_message = multilingual_manager.get_translation('goodbye', ss.user_language)
 
-    if utils.is_exit_command(user_input):
+    if utils.is_exit_command(user_input, user_input_lower):
         return exit_message
 
-    current_stage = st.session_state.stage
+    current_stage = ss.stage
 
     # Validate conversation context
     is_valid, context_message = utils.validate_conversation_context(user_input, current_stage)
     if not is_valid:
-        st.session_state.error_count += 1
-        if st.session_state.error_count >= 3:
+        ss.error_count += 1
+        if ss.error_count >= 3:
             return "I notice we're having some difficulty staying on topic. Let's focus on completing your application. " + context_message
         return context_message
 
     response = ""
 
     try:
-        if current_stage == STAGES['NAME']:
+        if current_stage == Stage.NAME:
             if len(user_input.strip()) < 2:
                 return "Please provide your full name (at least 2 characters)."
-            st.session_state.candidate_info['name'] = user_input.strip()
-            st.session_state.conversation_started = True
+            ss.candidate_info['name'] = user_input.strip()
+            ss.conversation_started = True
             response = f"Nice to meet you, {user_input.strip()}! {STAGE_QUESTIONS['EMAIL']}"
-            st.session_state.stage = STAGES['EMAIL']
-
-        elif current_stage == STAGES['EMAIL']:
-            if utils.validate_email(user_input):
-                st.session_state.candidate_info['email'] = user_input.strip()
-                response = STAGE_QUESTIONS['PHONE']
-                st.session_state.stage = STAGES['PHONE']
-                st.session_state.error_count = 0  # Reset error count on success
-            else:
-                st.session_state.error_count += 1
-                if st.session_state.error_count >= 3:
-                    response = "I'm having trouble with the email format. Please provide a valid email address like: example@company.com"
-                else:
-                    response = "Please provide a valid email address (e.g., john.doe@email.com)."
-
-        elif current_stage == STAGES['PHONE']:
-            if utils.validate_phone(user_input):
-                st.session_state.candidate_info['phone'] = user_input.strip()
-                response = STAGE_QUESTIONS['EXPERIENCE']
-                st.session_state.stage = STAGES['EXPERIENCE']
-                st.session_state.error_count = 0
-            else:
-                st.session_state.error_count += 1
-                if st.session_state.error_count >= 3:
-                    response = "Please provide a valid phone number with 10-15 digits. You can include country code if needed (e.g., +1234567890)."
-                else:
-                    response = "Please provide a valid phone number (e.g., +1234567890 or 1234567890)."
-
-        elif current_stage == STAGES['EXPERIENCE']:
-            is_valid, years = utils.validate_experience(user_input)
-            if is_valid:
-                st.session_state.candidate_info['experience'] = years
-                response = STAGE_QUESTIONS['POSITION']
-                st.session_state.stage = STAGES['POSITION']
-                st.session_state.error_count = 0
+            ss.stage = Stage.EMAIL
+
+        elif current_stage in STAGE_VALIDATORS:
+            field, parse, next_stage, soft_message, hard_message = STAGE_VALIDATORS[current_stage]
+            value = parse(user_input)
+            if value is None:
+                ss.error_count += 1
+                return hard_message if ss.error_count >= 3 else soft_message
+
+            ss.candidate_info[field] = value
+            ss.error_count = 0  # Reset error count on success
+
+            if current_stage == Stage.TECH_STACK:
+                with st.spinner("Generating personalized technical questions..."):
+                    technical_questions = utils.generate_technical_questions_cached(value)
+                ss.candidate_info['technical_questions'] = technical_questions
+
+                tech_list = ", ".join(value)
+                response = f"Excellent! I see you're skilled in: {tech_list}\n\nHere are some technical questions based on your expertise:\n\n" + "\n".join(technical_questions) + "\n\nPlease provide your answers to these questions:"
             else:
-                st.session_state.error_count += 1
-                if st.session_state.error_count >= 3:
-                    response = "Please provide your experience as a number (e.g., '3' for 3 years, '2.5' for 2.5 years, or '0' for entry level)."
-                else:
-                    response = "Please provide your experience in years as a number (e.g., 5, 2.5, or 0 for entry level)."
+                response = STAGE_QUESTIONS[next_stage.name]
+            ss.stage = next_stage
 
-        elif current_stage == STAGES['POSITION']:
+        elif current_stage == Stage.POSITION:
             if len(user_input.strip()) < 2:
                 return "Please provide the position you're interested in (e.g., Software Developer, Data Scientist)."
-            st.session_state.candidate_info['position'] = user_input.strip()
+            ss.candidate_info['position'] = user_input.strip()
             response = STAGE_QUESTIONS['LOCATION']
-            st.session_state.stage = STAGES['LOCATION']
+            ss.stage = Stage.LOCATION
 
-        elif current_stage == STAGES['LOCATION']:
+        elif current_stage == Stage.LOCATION:
             if len(user_input.strip()) < 2:
                 return "Please provide your current location (e.g., New York, NY or Remote)."
-            st.session_state.candidate_info['location'] = user_input.strip()
+            ss.candidate_info['location'] = user_input.strip()
             response = STAGE_QUESTIONS['TECH_STACK']
-            st.session_state.stage = STAGES['TECH_STACK']
-
-        elif current_stage == STAGES['TECH_STACK']:
-            tech_stack = utils.parse_tech_stack(user_input)
-            if tech_stack:
-                st.session_state.candidate_info['tech_stack'] = tech_stack
-                with st.spinner("Generating personalized technical questions..."):
-                    technical_questions = utils.generate_technical_questions(tech_stack)
-                st.session_state.candidate_info['technical_questions'] = technical_questions
+            ss.stage = Stage.TECH_STACK
 
-                tech_list = ", ".join(tech_stack)
-                response = f"Excellent! I see you're skilled in: {tech_list}\n\nHere are some technical questions based on your expertise:\n\n" + "\n".join(technical_questions) + "\n\nPlease provide your answers to these questions:"
-                st.session_state.stage = STAGES['TECHNICAL_QUESTIONS']
-            else:
-                st.session_state.error_count += 1
-                if st.session_state.error_count >= 3:
-                    response = "Please list at least one technology you know. For example: 'Python, JavaScript' or 'React, Node.js, MongoDB'."
-                else:
-                    response = "Please provide at least one technology you're proficient in (e.g., Python, JavaScript, React)."
-
-        elif current_stage == STAGES['TECHNICAL_QUESTIONS']:
+        elif current_stage == Stage.TECHNICAL_QUESTIONS:
             if len(user_input.strip()) < 10:
                 return "Please provide more detailed answers to the technical questions."
-            st.session_state.candidate_info['technical_answers'] = user_input.strip()
-            response = utils.format_candidate_summary(st.session_state.candidate_info)
-            st.session_state.stage = STAGES['CONCLUSION']
+            ss.candidate_info['technical_answers'] = user_input.strip()
+            response = utils.format_candidate_summary(ss.candidate_info)
+            ss.stage = Stage.CONCLUSION
 
-        elif current_stage == STAGES['CONCLUSION']:
+        elif current_stage == Stage.CONCLUSION:
             response = "Thank you! Your application has been completed. Is there anything else you'd like to add or any questions about the next steps?"
 
     except Exception as e:
@@ -205,17 +262,47 @@ def process_user_input(user_input: str) -> str:
 
     return response
 
+def handle_chat_turn(user_input: str):
+    """Record a user message and the assistant's response in session state."""
+    ss = st.session_state
+    user_message = {"role": "user", "content": user_input}
+    ss.messages.append(user_message)
+
+    # Get assistant response (state transitions must never be served from cache)
+    with st.spinner("Processing your response..."):
+        response = process_user_input(user_input)
+
+    if ADVANCED_FEATURES_AVAILABLE:
+        history = ss.sentiment_history
+        latest_sentiment = history[-1] if history else None
+
+        if latest_sentiment is not None:
+            # Remember which sentiment entry belongs to this message for rendering
+            user_message["sentiment_idx"] = len(history) - 1
+
+            # Add personalized encouragement
+            encouragement = personalization_manager.get_personalized_encouragement(
+                ss.user_preferences,
+                latest_sentiment.polarity
+            )
+            if encouragement and latest_sentiment.polarity < -0.2:
+                response = f"{encouragement}\n\n{response}"
+
+    ss.messages.append({"role": "assistant", "content": response})
+
+    # Update completion rate
+    if ADVANCED_FEATURES_AVAILABLE:
+        ss.conversation_metrics['completion_rate'] = stage_view(ss.stage).progress
+
 def main():
     """Main application function with advanced features."""
 
     # Initialize session state first
     initialize_session_state()
 
-    # Apply enhanced UI styling
+    # Apply enhanced UI styling (plus RTL CSS if needed)
     if ADVANCED_FEATURES_AVAILABLE:
-        enhanced_ui.inject_custom_css()
-
-        # Apply RTL CSS if needed
+        enhanced_ui.inject_stylesheet_once()
         rtl_css = multilingual_manager.get_rtl_css(st.session_state.user_language)
         if rtl_css:
             st.markdown(rtl_css, unsafe_allow_html=True)
@@ -244,6 +331,20 @@ def main():
             </style>
         """, unsafe_allow_html=True)
 
+    # Handle new chat input before rendering, so the sidebar and chat history
+    # reflect this turn without a second script run
+    input_placeholder = "Type your message here..."
+    if ADVANCED_FEATURES_AVAILABLE:
+        if st.session_state.user_language == 'es':
+            input_placeholder = "Escribe tu mensaje aquí..."
+        elif st.session_state.user_language == 'fr':
+            input_placeholder = "Tapez votre message ici..."
+        elif st.session_state.user_language == 'de':
+            input_placeholder = "Geben Sie hier Ihre Nachricht ein..."
+
+    if user_input := st.chat_input(input_placeholder):
+        handle_chat_turn(user_input)
+
     # Enhanced Sidebar with advanced features
     with st.sidebar:
         # Language selector (if advanced features available)
@@ -258,31 +359,18 @@ def main():
 
         # Progress indicator with enhanced UI
         current_stage = st.session_state.stage
-        total_stages = len(STAGES) - 1  # Exclude conclusion stage
-        progress = min(current_stage / total_stages, 1.0)
+        view = stage_view(current_stage)
 
         if ADVANCED_FEATURES_AVAILABLE:
-            stage_names = {
-                0: "Personal Information",
-                1: "Contact Details",
-                2: "Phone Number",
-                3: "Experience Level",
-                4: "Desired Position",
-                5: "Location",
-                6: "Technical Skills",
-                7: "Technical Assessment",
-                8: "Complete"
-            }
-            current_stage_name = stage_names.get(current_stage, "Unknown")
-            enhanced_ui.create_progress_bar(progress, current_stage_name)
+            enhanced_ui.create_progress_bar(view.progress, view.name)
         else:
             # Fallback progress bar
             st.markdown(f"""
             <div class="progress-bar">
-                <div class="progress-fill" style="width: {progress * 100}%"></div>
+                <div class="progress-fill" style="width: {view.progress * 100}%"></div>
             </div>
             <p style="text-align: center; margin: 0.5rem 0;">
-                Step {min(current_stage + 1, total_stages)} of {total_stages}
+                Step {view.step} of {TOTAL_STAGES}
             </p>
             """, unsafe_allow_html=True)
 
@@ -303,43 +391,30 @@ def main():
             enhanced_ui.create_enhanced_conversation_metrics(st.session_state.conversation_metrics)
 
             # Live sentiment chart if we have sentiment history
-            if len(st.session_state.sentiment_history) > 2:
+            history = st.session_state.sentiment_history
+            if history is not None and len(history) > 2:
                 st.markdown("### 📈 Sentiment Trend")
-                enhanced_ui.create_live_sentiment_chart(st.session_state.sentiment_history)
+                enhanced_ui.create_live_sentiment_chart(history)
 
             # Accessibility toolbar
             enhanced_ui.create_accessibility_toolbar()
 
         # Current stage indicator (fallback for non-advanced mode)
         if not ADVANCED_FEATURES_AVAILABLE:
-            stage_names = {
-                0: "👤 Personal Information",
-                1: "📧 Contact Details",
-                2: "📞 Phone Number",
-                3: "💼 Experience Level",
-                4: "🎯 Desired Position",
-                5: "📍 Location",
-                6: "💻 Technical Skills",
-                7: "🔍 Technical Assessment",
-                8: "✅ Complete"
-            }
-
-            current_stage_name = stage_names.get(current_stage, "Unknown")
             st.markdown(f"""
             <div class="stage-indicator">
                 <strong>Current Step:</strong><br>
-                {current_stage_name}
+                {view.icon_name}
             </div>
             """, unsafe_allow_html=True)
 
         # Reset conversation button
         if st.button("🔄 Start New Application"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            st.session_state.clear()
             st.rerun()
 
         # Export data button (only show if conversation is complete)
-        if current_stage >= STAGES['CONCLUSION'] and st.session_state.candidate_info:
+        if current_stage >= Stage.CONCLUSION and st.session_state.candidate_info:
             st.subheader("📥 Export Data")
             col1, col2 = st.columns(2)
 
@@ -367,6 +442,8 @@ def main():
 
     # Enhanced main content area
     if ADVANCED_FEATURES_AVAILABLE:
+        # Header and welcome card go out as a single markdown element
+        enhanced_ui.begin_batch()
         enhanced_ui.create_animated_header(
             "TalentScout - AI Hiring Assistant",
             "Intelligent recruitment powered by advanced AI technology"
@@ -375,6 +452,7 @@ def main():
         # Show simple welcome message for new users
         if not st.session_state.conversation_started:
             enhanced_ui.create_simple_welcome_message()
+        enhanced_ui.flush_batch()
 
         # Welcome message in user's language
         welcome_text = multilingual_manager.get_translation('welcome_message', st.session_state.user_language)
@@ -424,113 +502,38 @@ def main():
     # Enhanced Chat interface
     chat_container = st.container()
     with chat_container:
-        for i, message in enumerate(st.session_state.messages):
+        for message in st.session_state.messages:
             with st.chat_message(message["role"]):
-                # Enhanced message display with sentiment if available
-                if ADVANCED_FEATURES_AVAILABLE and message["role"] == "user" and i > 0:
-                    # Show sentiment for user messages (skip first assistant message)
-                    sentiment_idx = (i - 1) // 2  # Adjust for assistant/user alternation
-                    if sentiment_idx < len(st.session_state.sentiment_history):
-                        sentiment = st.session_state.sentiment_history[sentiment_idx]
-                        emoji = sentiment_analyzer.get_emotion_emoji(sentiment.emotion)
-                        st.write(f"{emoji} {message['content']}")
-                    else:
-                        st.write(message["content"])
+                if ADVANCED_FEATURES_AVAILABLE:
+                    # Show sentiment for user messages and language flag for assistant messages
+                    emoji = ""
+                    sentiment_idx = message.get("sentiment_idx")
+                    if sentiment_idx is not None:
+                        emoji = st.session_state.sentiment_history.emoji(sentiment_idx)
+                    st.markdown(_format_chat_message(
+                        message["role"],
+                        message["content"],
+                        st.session_state.user_language,
+                        emoji
+                    ))
                 else:
-                    # Format message with language if available
-                    if ADVANCED_FEATURES_AVAILABLE and message["role"] == "assistant":
-                        formatted_message = multilingual_manager.format_message_with_language(
-                            message["content"],
-                            st.session_state.user_language
-                        )
-                        st.write(formatted_message)
-                    else:
-                        st.write(message["content"])
-
-    # Enhanced User input with smart features
-    input_placeholder = "Type your message here..."
-    if ADVANCED_FEATURES_AVAILABLE:
-        if st.session_state.user_language == 'es':
-            input_placeholder = "Escribe tu mensaje aquí..."
-        elif st.session_state.user_language == 'fr':
-            input_placeholder = "Tapez votre message ici..."
-        elif st.session_state.user_language == 'de':
-            input_placeholder = "Geben Sie hier Ihre Nachricht ein..."
+                    st.markdown(message["content"])
 
     # Add contextual hints based on current stage
-    current_stage = st.session_state.stage
-    stage_hints = {
-        0: "💡 Tip: Just type your full name to get started!",
-        1: "💡 Tip: Use your professional email address",
-        2: "💡 Tip: Include country code if international (e.g., +1234567890)",
-        3: "💡 Tip: You can say '3 years' or just '3' - I understand both!",
-        4: "💡 Tip: Be specific about the role you want (e.g., 'Senior Python Developer')",
-        5: "💡 Tip: You can say 'Remote' or specify a city",
-        6: "💡 Tip: List technologies separated by commas (e.g., 'Python, React, AWS')"
-    }
-
-    if current_stage in stage_hints:
-        st.info(stage_hints[current_stage])
+    if view.hint:
+        st.info(view.hint)
 
     # Show smart input helpers for specific stages
-    if ADVANCED_FEATURES_AVAILABLE and current_stage == 6:  # Tech stack stage
+    if ADVANCED_FEATURES_AVAILABLE and current_stage == Stage.TECH_STACK:
         with st.expander("🛠️ Tech Stack Builder (Optional)", expanded=False):
             try:
                 from smart_input_helper import smart_input_helper
                 selected_techs = smart_input_helper.create_tech_stack_builder()
                 if selected_techs and st.button("Use Selected Technologies"):
-                    tech_string = ", ".join(selected_techs)
-                    st.session_state.messages.append({"role": "user", "content": tech_string})
-                    response = process_user_input(tech_string)
-                    st.session_state.messages.append({"role": "assistant", "content": response})
+                    handle_chat_turn(", ".join(selected_techs))
                     st.rerun()
             except ImportError:
                 pass
 
-    if user_input := st.chat_input(input_placeholder):
-        # Show loading spinner for advanced features
-        if ADVANCED_FEATURES_AVAILABLE:
-            with st.spinner("Processing your response..."):
-                time.sleep(0.5)  # Brief pause for better UX
-
-        with st.chat_message("user"):
-            st.write(user_input)
-        st.session_state.messages.append({"role": "user", "content": user_input})
-
-        # Get assistant response with performance optimization
-        if ADVANCED_FEATURES_AVAILABLE:
-            # Use cached response if available
-            @performance_optimizer.timed_cache(ttl_seconds=300)
-            def get_cached_response(input_text, stage=None):
-                # Stage parameter used for cache key differentiation in decorator
-                _ = stage  # Acknowledge parameter usage
-                return process_user_input(input_text)
-
-            response = get_cached_response(user_input, st.session_state.stage)
-        else:
-            response = process_user_input(user_input)
-
-        # Add personalized encouragement if advanced features available
-        if ADVANCED_FEATURES_AVAILABLE and st.session_state.sentiment_history:
-            latest_sentiment = st.session_state.sentiment_history[-1]
-            encouragement = personalization_manager.get_personalized_encouragement(
-                st.session_state.user_preferences,
-                latest_sentiment.polarity
-            )
-            if encouragement and latest_sentiment.polarity < -0.2:
-                response = f"{encouragement}\n\n{response}"
-
-        with st.chat_message("assistant"):
-            st.write(response)
-        st.session_state.messages.append({"role": "assistant", "content": response})
-
-        # Update completion rate
-        if ADVANCED_FEATURES_AVAILABLE:
-            completion_rate = min(st.session_state.stage / (len(STAGES) - 1), 1.0)
-            st.session_state.conversation_metrics['completion_rate'] = completion_rate
-
-        # Auto-scroll to bottom
-        st.rerun()
-
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,40 +1,82 @@
+import json
+import re
+from enum import IntEnum
+from functools import lru_cache
+from pathlib import Path
 from decouple import config
 
 # API Configuration
 OPENAI_API_KEY = config('OPENAI_API_KEY')
 
+# Optional shared cache for LLM results (e.g. redis://localhost:6379/0)
+REDIS_URL = config('REDIS_URL', default='')
+LLM_CACHE_TTL_SECONDS = 86400
+
 # Model Configuration
 MODEL_NAME = "gpt-4-turbo-preview"
 TEMPERATURE = 0.7
 MAX_TOKENS = 1000
 
-# System Prompts
-SYSTEM_PROMPT = """You are a technical interviewer for TalentScout, a technology recruitment agency. 
-Your role is to generate relevant and challenging technical questions based on candidates' tech stacks.
-Focus on fundamental understanding, practical application, and problem-solving abilities."""
+# Interview Stages
+class Stage(IntEnum):
+    NAME = 0
+    EMAIL = 1
+    PHONE = 2
+    EXPERIENCE = 3
+    POSITION = 4
+    LOCATION = 5
+    TECH_STACK = 6
+    TECHNICAL_QUESTIONS = 7
+    CONCLUSION = 8
+
+# Name -> id mapping kept for existing callers
+STAGES = {stage.name: stage.value for stage in Stage}
 
-# Chatbot Configuration
-INITIAL_PROMPT = """You are an AI Hiring Assistant for TalentScout, a technology recruitment agency. 
-Your role is to conduct initial candidate screenings professionally and effectively. 
-Maintain a friendly yet professional tone throughout the conversation."""
+# Display names for each stage, indexed by stage id
+STAGE_NAMES = (
+    "Personal Information",
+    "Contact Details",
+    "Phone Number",
+    "Experience Level",
+    "Desired Position",
+    "Location",
+    "Technical Skills",
+    "Technical Assessment",
+    "Complete"
+)
 
-# System Messages
-WELCOME_MESSAGE = """Welcome to TalentScout! 👋 
-I'm your AI Hiring Assistant, and I'll be helping you with the initial screening process. 
-I'll collect some information about you and ask relevant technical questions based on your expertise.
-Let's get started! Could you please tell me your full name?"""
+STAGE_NAMES_WITH_ICONS = (
+    "👤 Personal Information",
+    "📧 Contact Details",
+    "📞 Phone Number",
+    "💼 Experience Level",
+    "🎯 Desired Position",
+    "📍 Location",
+    "💻 Technical Skills",
+    "🔍 Technical Assessment",
+    "✅ Complete"
+)
 
-# Interview Stages
-STAGES = {
-    'NAME': 0,
-    'EMAIL': 1,
-    'PHONE': 2,
-    'EXPERIENCE': 3,
-    'POSITION': 4,
-    'LOCATION': 5,
-    'TECH_STACK': 6,
-    'TECHNICAL_QUESTIONS': 7,
-    'CONCLUSION': 8
+# What the candidate is asked for at each input stage, used when a reply isn't understood
+STAGE_INPUT_DESCRIPTIONS = (
+    "your name",
+    "your email address",
+    "your phone number",
+    "your years of experience",
+    "your desired position",
+    "your location",
+    "your technical skills"
+)
+
+# Contextual input hints shown below the chat for each stage
+STAGE_HINTS = {
+    0: "💡 Tip: Just type your full name to get started!",
+    1: "💡 Tip: Use your professional email address",
+    2: "💡 Tip: Include country code if international (e.g., +1234567890)",
+    3: "💡 Tip: You can say '3 years' or just '3' - I understand both!",
+    4: "💡 Tip: Be specific about the role you want (e.g., 'Senior Python Developer')",
+    5: "💡 Tip: You can say 'Remote' or specify a city",
+    6: "💡 Tip: List technologies separated by commas (e.g., 'Python, React, AWS')"
 }
 
 # Questions for each stage
@@ -47,82 +89,65 @@ STAGE_QUESTIONS = {
     'TECH_STACK': "Please list the technologies you're proficient in (programming languages, frameworks, databases, tools, etc.):",
 }
 
-# Enhanced technical assessment prompt
-TECH_ASSESSMENT_PROMPT = """Based on the candidate's tech stack: {tech_stack}
-
-Generate exactly 4-5 relevant technical questions that:
-1. Assess fundamental understanding of core concepts
-2. Test practical application and real-world usage
-3. Evaluate problem-solving and debugging abilities
-4. Explore best practices and optimization techniques
-
-Requirements:
-- Each question should be specific to the mentioned technologies
-- Questions should be appropriate for different experience levels
-- Include both theoretical and practical aspects
-- Format as a numbered list with clear, concise questions
-- Each question should end with a question mark
-
-Example format:
-1. [Specific technical question about technology X]?
-2. [Practical scenario question about technology Y]?
-"""
+# ASCII-only messages shorter than this skip language detection
+ASCII_LANG_DETECT_MIN_LENGTH = 40
 
 # Exit keywords
-EXIT_KEYWORDS = ['quit', 'exit', 'bye', 'goodbye', 'end', 'stop', 'finish', 'done']
+EXIT_KEYWORDS = frozenset({'quit', 'exit', 'bye', 'goodbye', 'end', 'stop', 'finish', 'done'})
 
 # Validation patterns
 EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 PHONE_PATTERN = r'^\+?1?\d{9,15}$'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+PHONE_RE = re.compile(PHONE_PATTERN)
+
+# Whole-word topic filters for candidate input (plurals included)
+OFF_TOPIC_RE = re.compile(
+    r'\b(?:weather|sports?|politics|foods?|movies?|music|games?|celebrity|celebrities|news|jokes?|story|stories)\b',
+    re.IGNORECASE
+)
+INAPPROPRIATE_RE = re.compile(r'\b(?:hate|hates|violence|illegal|drugs?)\b', re.IGNORECASE)
+
+# One tech stack entry: a run of text between ',', ';', '|' or newline separators
+TECH_TOKEN_RE = re.compile(r'[^,;|\n]+')
+
+# Common aliases for technologies in the fallback question bank
+FALLBACK_ALIASES = {
+    'js': 'javascript',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'py': 'python',
+    'reactjs': 'react',
+    'postgres': 'sql',
+    'postgresql': 'sql',
+    'mysql': 'sql'
+}
+
+# Long prompts, the welcome message and FALLBACK_QUESTIONS live in
+# resources/strings.json and are only loaded when first needed
+STRINGS_PATH = Path(__file__).parent / 'resources' / 'strings.json'
+
+@lru_cache(maxsize=None)
+def load_strings() -> dict:
+    """Load prompt strings and fallback questions from the resources file."""
+    return json.loads(STRINGS_PATH.read_text(encoding='utf-8'))
+
+@lru_cache(maxsize=None)
+def get_fallback_index() -> dict:
+    """Lowercase lookup index over the fallback questions, including aliases."""
+    index = {tech.lower(): questions for tech, questions in load_strings()['FALLBACK_QUESTIONS'].items()}
+    index.update({
+        alias: index[tech]
+        for alias, tech in FALLBACK_ALIASES.items()
+        if tech in index
+    })
+    return index
 
-# Fallback technical questions for common technologies
-FALLBACK_QUESTIONS = {
-    'python': [
-        "What are the key differences between lists and tuples in Python?",
-        "How do you handle exceptions in Python and why is it important?",
-        "Explain the concept of decorators in Python with an example.",
-        "What is the difference between '==' and 'is' operators in Python?"
-    ],
-    'javascript': [
-        "What is the difference between 'let', 'const', and 'var' in JavaScript?",
-        "How do you handle asynchronous operations in JavaScript?",
-        "Explain event bubbling and event capturing in JavaScript.",
-        "What are closures in JavaScript and how are they useful?"
-    ],
-    'react': [
-        "What is the difference between state and props in React?",
-        "How do you optimize React component performance?",
-        "Explain the React component lifecycle methods.",
-        "What are React Hooks and why were they introduced?"
-    ],
-    'node.js': [
-        "What is the event loop in Node.js and how does it work?",
-        "How do you handle file operations in Node.js?",
-        "What are the differences between Node.js and browser JavaScript?",
-        "How do you manage dependencies in a Node.js project?"
-    ],
-    'sql': [
-        "What is the difference between INNER JOIN and LEFT JOIN?",
-        "How do you optimize a slow-performing SQL query?",
-        "Explain the concept of database normalization.",
-        "What are indexes and how do they improve query performance?"
-    ],
-    'java': [
-        "What is the difference between abstract classes and interfaces in Java?",
-        "How does garbage collection work in Java?",
-        "Explain the concept of polymorphism in Java.",
-        "What are the main principles of Object-Oriented Programming?"
-    ],
-    'aws': [
-        "What are the main differences between EC2, ECS, and Lambda?",
-        "How do you secure data in AWS S3 buckets?",
-        "Explain the concept of Auto Scaling in AWS.",
-        "What is the difference between RDS and DynamoDB?"
-    ],
-    'docker': [
-        "What is the difference between a Docker image and a container?",
-        "How do you optimize Docker image size?",
-        "Explain the purpose of a Dockerfile.",
-        "What are the benefits of using Docker in development?"
-    ]
-}
\ No newline at end of file
+def __getattr__(name: str):
+    """Keep `from config import WELCOME_MESSAGE` and friends working lazily."""
+    if name == 'FALLBACK_INDEX':
+        return get_fallback_index()
+    strings = load_strings()
+    if name in strings:
+        return strings[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
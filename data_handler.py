@@ -6,59 +6,263 @@ Handles secure data storage, validation, and export functionality.
 import json
 import csv
 import hashlib
+from binascii import hexlify
 import os
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import streamlit as st
+from config import EMAIL_RE, PHONE_RE
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Buffered output: 1 MiB write buffer, CSV flushed every N rows on bulk exports
+WRITE_BUFFER_SIZE = 1 << 20
+CSV_FLUSH_EVERY = 1000
+
+# Shown to candidates before any data is collected
+PRIVACY_NOTICE = """
+## 🔒 Data Privacy Notice
+
+Your privacy is important to us. Here's how we handle your data:
+
+- **Local Storage**: All data is stored locally on this system
+- **No Cloud Upload**: Your information is not automatically uploaded to external servers
+- **Secure Handling**: Sensitive data is processed securely
+- **Data Control**: You can export or delete your data at any time
+- **Compliance**: We follow data privacy best practices
+
+By continuing, you consent to the collection and processing of your information for recruitment purposes.
+        """
+
+# Saved sessions are appended to a single JSON Lines file
+SESSIONS_FILE = "sessions.jsonl"
+
+# Fields a candidate record must have to be considered complete (report order)
+REQUIRED_FIELDS = ('name', 'email', 'phone', 'experience', 'position', 'location', 'tech_stack')
+
+
+def hash16(data: bytes) -> str:
+    """Return the first 16 hex characters of the SHA-256 digest of data."""
+    return hexlify(hashlib.sha256(data).digest()[:8]).decode()
+
+
+@lru_cache(maxsize=4096)
+def hash_text(data: str) -> str:
+    """Memoized hash16 of a string; the same email is hashed on every rerun."""
+    return hash16(data.encode())
+
+
+def session_hash(data: bytes) -> str:
+    """Short 64-bit BLAKE2b identifier for intra-app keys such as session IDs."""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def clean_tech_stack(tech_stack: List[str]) -> List[str]:
+    """Strip each technology and drop blank entries in a single pass."""
+    return [tech for tech in map(str.strip, tech_stack) if tech]
+
+
+def write_json(filepath: str, data: Any) -> None:
+    """Write data to filepath as indented UTF-8 JSON."""
+    if orjson is not None:
+        # Hand the encoded buffer straight to the OS, skipping the buffered writer
+        buf = memoryview(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            while buf:
+                buf = buf[os.write(fd, buf):]
+        finally:
+            os.close(fd)
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def iso_timestamp() -> str:
+    """Current local time as an ISO 8601 string, to the second."""
+    return "%04d-%02d-%02dT%02d:%02d:%02d" % time.localtime()[:6]
+
+
+def freeze_candidate(candidate_info: Dict) -> tuple:
+    """Build a hashable, order-independent key from candidate data."""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in candidate_info.items()
+    ))
+
+
+# Report sections, compiled once and filled with str.format_map
+REPORT_PROFILE_TEMPLATE = """
+## Personal Information
+- **Name**: {name}
+- **Email**: {email}
+- **Phone**: {phone}
+- **Location**: {location}
+
+## Professional Information
+- **Experience**: {experience} years
+- **Desired Position**: {position}
+- **Technical Skills**: {tech_skills}
+
+## Technical Assessment
+### Questions Asked:
+"""
+
+REPORT_RESPONSES_TEMPLATE = "\n### Candidate Responses:\n{technical_answers}\n"
+
+REPORT_MISSING_TEMPLATE = "\n## ⚠️ Missing Information\nThe following fields are incomplete: {missing}\n"
+
+REPORT_NEXT_STEPS = "\n## Next Steps\n- Review technical responses\n- Schedule follow-up interview if qualified\n- Contact candidate with decision\n"
+
+
+class _ReportFields(dict):
+    """Candidate fields for the report templates; missing keys render as N/A."""
+    
+    def __missing__(self, key: str) -> str:
+        return 'N/A'
+
+
+@lru_cache(maxsize=512)
+def _render_report_body(frozen_info: tuple, completeness: Optional[tuple] = None) -> str:
+    """Render everything in the candidate report below the timestamp."""
+    fields = _ReportFields(frozen_info)
+    is_complete, missing_fields = completeness or data_handler.validate_data_completeness(fields)
+    fields['tech_skills'] = ', '.join(fields.get('tech_stack', []))
+    fields.setdefault('technical_answers', 'No responses provided')
+    
+    questions = fields.get('technical_questions', [])
+    parts = [
+        REPORT_PROFILE_TEMPLATE.format_map(fields),
+        "".join(f"{i}. {question}\n" for i, question in enumerate(questions, 1)),
+        REPORT_RESPONSES_TEMPLATE.format_map(fields)
+    ]
+    
+    if not is_complete:
+        parts.append(REPORT_MISSING_TEMPLATE.format(missing=', '.join(missing_fields)))
+    
+    parts.append(REPORT_NEXT_STEPS)
+    
+    return "".join(parts)
+
+
+def json_line(data: Any) -> bytes:
+    """Encode data as one compact line of UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+def csv_value(value: Any) -> Any:
+    """Flatten list and dict values into a single CSV cell."""
+    if isinstance(value, list):
+        return ', '.join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
 
 
 class SecureDataHandler:
     """Handles secure data operations for candidate information."""
     
+    # Directories already created in this process, shared by all instances
+    _ensured_dirs = set()
+    
     def __init__(self):
         self.data_dir = "candidate_data"
+        self._timestamp_cache = (None, "")
+        self.session_index = {}
+        # Byte length of the sessions file already covered by session_index
+        self._indexed_size = 0
         self.ensure_data_directory()
     
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist."""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        if self.data_dir not in self._ensured_dirs:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self._ensured_dirs.add(self.data_dir)
+    
+    def _timestamp(self) -> str:
+        """File-name timestamp, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._timestamp_cache[0]:
+            self._timestamp_cache = (now, time.strftime("%Y%m%d_%H%M%S", time.localtime(now)))
+        return self._timestamp_cache[1]
     
     def hash_sensitive_data(self, data: str) -> str:
         """Hash sensitive data for privacy."""
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        return hash_text(data)
+
+    def hash_sensitive_data_batch(self, items: List[str]) -> List[str]:
+        """Hash a batch of sensitive values in one call."""
+        return list(map(hash_text, items))
     
-    def sanitize_candidate_data(self, candidate_info: Dict) -> Dict:
+    def sanitize_candidate_data(self, candidate_info: Dict, submission_time: Optional[str] = None) -> Dict:
         """Sanitize candidate data for storage/export."""
-        sanitized = candidate_info.copy()
+        # Build the output in one pass, formatting the tech stack as we go
+        sanitized = {
+            key: clean_tech_stack(value) if key == 'tech_stack' and isinstance(value, list) else value
+            for key, value in candidate_info.items()
+        }
         
         # Add timestamp
-        sanitized['submission_time'] = datetime.now().isoformat()
+        sanitized['submission_time'] = submission_time or iso_timestamp()
         
         # Hash email for privacy (optional)
         if 'email' in sanitized:
             sanitized['email_hash'] = self.hash_sensitive_data(sanitized['email'])
         
-        # Ensure tech stack is properly formatted
-        if 'tech_stack' in sanitized and isinstance(sanitized['tech_stack'], list):
-            sanitized['tech_stack'] = [tech.strip() for tech in sanitized['tech_stack']]
-        
         return sanitized
     
+    def sanitize_candidate_data_batch(self, candidates: List[Dict], submission_time: Optional[str] = None) -> List[Dict]:
+        """Sanitize many candidates at once, cleaning all tech stacks in a single loop."""
+        submission_time = submission_time or iso_timestamp()
+        
+        # Flatten every tech stack into one list, remembering where each one ends
+        flat_techs = []
+        offsets = []
+        for candidate in candidates:
+            tech_stack = candidate.get('tech_stack')
+            if isinstance(tech_stack, list):
+                flat_techs.extend(tech_stack)
+            offsets.append(len(flat_techs))
+        flat_techs = list(map(str.strip, flat_techs))
+        
+        email_hashes = iter(self.hash_sensitive_data_batch(
+            [candidate['email'] for candidate in candidates if 'email' in candidate]
+        ))
+        
+        results = []
+        start = 0
+        for candidate, end in zip(candidates, offsets):
+            sanitized = dict(candidate)
+            if isinstance(candidate.get('tech_stack'), list):
+                sanitized['tech_stack'] = [tech for tech in flat_techs[start:end] if tech]
+            sanitized['submission_time'] = submission_time
+            if 'email' in candidate:
+                sanitized['email_hash'] = next(email_hashes)
+            results.append(sanitized)
+            start = end
+        
+        return results
+    
     def export_to_json(self, candidate_info: Dict, filename: Optional[str] = None) -> str:
         """Export candidate data to JSON format."""
         try:
             sanitized_data = self.sanitize_candidate_data(candidate_info)
             
             if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = self._timestamp()
                 candidate_name = candidate_info.get('name', 'candidate').replace(' ', '_')
                 filename = f"candidate_{candidate_name}_{timestamp}.json"
             
             filepath = os.path.join(self.data_dir, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(sanitized_data, f, indent=2, ensure_ascii=False)
+            write_json(filepath, sanitized_data)
             
             return filepath
             
@@ -72,22 +276,45 @@ class SecureDataHandler:
             sanitized_data = self.sanitize_candidate_data(candidate_info)
             
             if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = self._timestamp()
                 candidate_name = candidate_info.get('name', 'candidate').replace(' ', '_')
                 filename = f"candidate_{candidate_name}_{timestamp}.csv"
             
             filepath = os.path.join(self.data_dir, filename)
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Field', 'Value'])
+            rows = [['Field', 'Value']]
+            rows.extend([key, csv_value(value)] for key, value in sanitized_data.items())
+            
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                csv.writer(f).writerows(rows)
+            
+            return filepath
+            
+        except Exception as e:
+            st.error(f"Error exporting to CSV: {e}")
+            return ""
+    
+    def export_many_to_csv(self, candidates: List[Dict], filename: Optional[str] = None) -> str:
+        """Export several candidates to a single CSV file, one row per candidate."""
+        try:
+            if not filename:
+                timestamp = self._timestamp()
+                filename = f"candidates_{timestamp}.csv"
+            
+            filepath = os.path.join(self.data_dir, filename)
+            sanitized = self.sanitize_candidate_data_batch(candidates)
+            
+            # Header is the union of all fields, in first-seen order
+            fieldnames = list(dict.fromkeys(key for candidate in sanitized for key in candidate))
+            
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, restval='')
+                writer.writeheader()
                 
-                for key, value in sanitized_data.items():
-                    if isinstance(value, list):
-                        value = ', '.join(map(str, value))
-                    elif isinstance(value, dict):
-                        value = json.dumps(value)
-                    writer.writerow([key, value])
+                for row_count, candidate in enumerate(sanitized, 1):
+                    writer.writerow({key: csv_value(value) for key, value in candidate.items()})
+                    if row_count % CSV_FLUSH_EVERY == 0:
+                        f.flush()
             
             return filepath
             
@@ -97,90 +324,120 @@ class SecureDataHandler:
     
     def validate_data_completeness(self, candidate_info: Dict) -> tuple[bool, List[str]]:
         """Validate that all required fields are present."""
-        required_fields = ['name', 'email', 'phone', 'experience', 'position', 'location', 'tech_stack']
-        missing_fields = []
-        
-        for field in required_fields:
-            if field not in candidate_info or not candidate_info[field]:
-                missing_fields.append(field)
-        
-        return len(missing_fields) == 0, missing_fields
+        missing_fields = [field for field in REQUIRED_FIELDS if not candidate_info.get(field)]
+        return not missing_fields, missing_fields
+    
+    def validate_formats(self, candidates: List[Dict]) -> List[bool]:
+        """Check email and phone formats for each candidate in one pass."""
+        email_match = EMAIL_RE.match
+        phone_match = PHONE_RE.match
+        return [
+            email_match(str(candidate.get('email', '')).strip()) is not None
+            and phone_match(str(candidate.get('phone', '')).strip()) is not None
+            for candidate in candidates
+        ]
     
-    def generate_candidate_report(self, candidate_info: Dict) -> str:
-        """Generate a comprehensive candidate report."""
-        is_complete, missing_fields = self.validate_data_completeness(candidate_info)
+    def generate_candidate_report(self, candidate_info: Dict,
+                                  completeness: Optional[tuple[bool, List[str]]] = None) -> str:
+        """Generate a comprehensive candidate report.
         
-        report = f"""
+        Pass the result of validate_data_completeness as completeness if the
+        caller already has it, to avoid validating the same data twice.
+        """
+        header = f"""
 # Candidate Assessment Report
 Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-## Personal Information
-- **Name**: {candidate_info.get('name', 'N/A')}
-- **Email**: {candidate_info.get('email', 'N/A')}
-- **Phone**: {candidate_info.get('phone', 'N/A')}
-- **Location**: {candidate_info.get('location', 'N/A')}
-
-## Professional Information
-- **Experience**: {candidate_info.get('experience', 'N/A')} years
-- **Desired Position**: {candidate_info.get('position', 'N/A')}
-- **Technical Skills**: {', '.join(candidate_info.get('tech_stack', []))}
-
-## Technical Assessment
-### Questions Asked:
 """
+        if completeness is not None:
+            completeness = (completeness[0], tuple(completeness[1]))
+        try:
+            body = _render_report_body(freeze_candidate(candidate_info), completeness)
+        except TypeError:
+            # Unhashable values (e.g. nested dicts) can't be cached
+            body = _render_report_body.__wrapped__(tuple(candidate_info.items()), completeness)
         
-        questions = candidate_info.get('technical_questions', [])
-        for i, question in enumerate(questions, 1):
-            report += f"{i}. {question}\n"
-        
-        report += f"\n### Candidate Responses:\n{candidate_info.get('technical_answers', 'No responses provided')}\n"
-        
-        if not is_complete:
-            report += f"\n## ⚠️ Missing Information\nThe following fields are incomplete: {', '.join(missing_fields)}\n"
+        return header + body
+    
+    def _build_session(self, candidate_info: Dict) -> Dict:
+        """Assemble the stored record for one candidate session."""
+        timestamp = self._timestamp()
+        # Random nonce: the same (or missing) email within one second must not collide
+        session_id = session_hash(
+            f"{candidate_info.get('email', 'unknown')}_{timestamp}_".encode() + os.urandom(8)
+        )
         
-        report += "\n## Next Steps\n- Review technical responses\n- Schedule follow-up interview if qualified\n- Contact candidate with decision\n"
+        sanitized = self.sanitize_candidate_data(candidate_info)
+        completeness = self.validate_data_completeness(candidate_info)
         
-        return report
+        return {
+            'session_id': session_id,
+            'candidate_data': sanitized,
+            'report': self.generate_candidate_report(candidate_info, completeness=completeness)
+        }
+    
+    def _append_sessions(self, sessions: List[Dict]):
+        """Append session records to the sessions file, indexing their offsets."""
+        filepath = os.path.join(self.data_dir, SESSIONS_FILE)
+        with open(filepath, 'ab', buffering=WRITE_BUFFER_SIZE) as f:
+            start = offset = f.tell()
+            for session_data in sessions:
+                line = json_line(session_data)
+                f.write(line)
+                self.session_index[session_data['session_id']] = offset
+                offset += len(line)
+        # Only extend the indexed range if nothing was appended by someone else in between
+        if start == self._indexed_size:
+            self._indexed_size = offset
     
     def save_candidate_session(self, candidate_info: Dict) -> bool:
         """Save candidate session data securely."""
+        return self.save_candidate_sessions([candidate_info])
+    
+    def save_candidate_sessions(self, candidates: List[Dict]) -> bool:
+        """Save several candidate sessions with a single file open."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            session_id = self.hash_sensitive_data(f"{candidate_info.get('email', 'unknown')}_{timestamp}")
-            
-            session_data = {
-                'session_id': session_id,
-                'candidate_data': self.sanitize_candidate_data(candidate_info),
-                'report': self.generate_candidate_report(candidate_info)
-            }
-            
-            filename = f"session_{session_id}.json"
-            filepath = os.path.join(self.data_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
-            
+            self._append_sessions([self._build_session(candidate) for candidate in candidates])
             return True
             
         except Exception as e:
             st.error(f"Error saving session: {e}")
             return False
     
+    def load_candidate_session(self, session_id: str) -> Optional[Dict]:
+        """Load a saved session by id, or None if it doesn't exist."""
+        filepath = os.path.join(self.data_dir, SESSIONS_FILE)
+        try:
+            with open(filepath, 'rb') as f:
+                if session_id not in self.session_index:
+                    # Index only what was appended since the last scan (e.g. by another process)
+                    self._index_sessions_from(f, self._indexed_size)
+                if session_id not in self.session_index:
+                    return None
+                f.seek(self.session_index[session_id])
+                return json.loads(f.readline())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Corrupt record
+            return None
+    
+    def _index_sessions_from(self, f, offset: int):
+        """Add session offsets from offset to the end of the file, stopping at a partial line."""
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # A write still in progress; pick it up on a later scan
+                break
+            try:
+                self.session_index[json.loads(line)['session_id']] = offset
+            except (ValueError, KeyError, TypeError):
+                pass  # Skip corrupt lines rather than failing every lookup
+            offset += len(line)
+        self._indexed_size = offset
+    
     def get_data_privacy_notice(self) -> str:
         """Return data privacy notice."""
-        return """
-## 🔒 Data Privacy Notice
-
-Your privacy is important to us. Here's how we handle your data:
-
-- **Local Storage**: All data is stored locally on this system
-- **No Cloud Upload**: Your information is not automatically uploaded to external servers
-- **Secure Handling**: Sensitive data is processed securely
-- **Data Control**: You can export or delete your data at any time
-- **Compliance**: We follow data privacy best practices
-
-By continuing, you consent to the collection and processing of your information for recruitment purposes.
-        """
+        return PRIVACY_NOTICE
 
 
 # Global instance for easy access
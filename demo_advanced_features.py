@@ -7,8 +7,17 @@ Interactive demonstration of all advanced capabilities
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Pauses between demo items are cosmetic; pass --slow to keep them
+SLOW_MODE = '--slow' in sys.argv
+
+def pause(seconds: float = 1):
+    """Pause between demo items when running with --slow."""
+    if SLOW_MODE:
+        time.sleep(seconds)
+
 def demo_sentiment_analysis():
     """Demonstrate sentiment analysis capabilities."""
     print("🧠 SENTIMENT ANALYSIS DEMO")
@@ -24,8 +33,11 @@ def demo_sentiment_analysis():
         ("I'm frustrated with my current job situation.", "Negative/Frustrated")
     ]
     
-    for text, expected in test_inputs:
-        result = sentiment_analyzer.analyze_sentiment(text)
+    # Analyse every input up front; the items are independent of each other
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(sentiment_analyzer.analyze_sentiment, [text for text, _ in test_inputs]))
+    
+    for (text, expected), result in zip(test_inputs, results):
         emoji = sentiment_analyzer.get_emotion_emoji(result.emotion)
         encouragement = sentiment_analyzer.get_encouragement_message(result)
         
@@ -33,7 +45,7 @@ def demo_sentiment_analysis():
         print(f"🎯 Expected: {expected}")
         print(f"{emoji} Detected: {result.emotion.title()} (polarity: {result.polarity:.2f})")
         print(f"💬 Response: {encouragement}")
-        time.sleep(1)
+        pause()
 
 def demo_multilingual_support():
     """Demonstrate multilingual capabilities."""
@@ -50,8 +62,10 @@ def demo_multilingual_support():
         ("مرحبا، أنا مهتم بمنصب المطور.", "ar")
     ]
     
-    for phrase, expected_lang in test_phrases:
-        detected = multilingual_manager.detect_language(phrase)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        detections = list(executor.map(multilingual_manager.detect_language, [phrase for phrase, _ in test_phrases]))
+    
+    for (phrase, expected_lang), detected in zip(test_phrases, detections):
         flag = multilingual_manager.supported_languages.get(detected, {}).flag if detected in multilingual_manager.supported_languages else "🏳️"
         
         print(f"\n📝 Input: \"{phrase}\"")
@@ -61,7 +75,7 @@ def demo_multilingual_support():
         # Show translation of welcome message
         welcome = multilingual_manager.get_translation('welcome_message', detected)
         print(f"💬 Welcome: {welcome[:60]}...")
-        time.sleep(1)
+        pause()
 
 def demo_personalization():
     """Demonstrate personalization features."""
@@ -81,7 +95,7 @@ def demo_personalization():
         print(f"\n🎨 Style: {style.title()}")
         print(f"👋 Greeting: {greeting}")
         print(f"💪 Encouragement: {encouragement}")
-        time.sleep(1)
+        pause()
     
     # Demo difficulty adaptation
     print(f"\n🎓 DIFFICULTY ADAPTATION")
@@ -93,7 +107,7 @@ def demo_personalization():
         
         print(f"\n📊 Experience: {years} years")
         print(f"🎯 Adaptation: {difficulty_prompt}")
-        time.sleep(1)
+        pause()
 
 def demo_performance_optimization():
     """Demonstrate performance optimization."""
@@ -159,17 +173,26 @@ def demo_integration():
         }
     ]
     
-    for i, scenario in enumerate(scenarios, 1):
+    # Steps 1 and 2 are independent across scenarios, so run them up front
+    inputs = [scenario['input'] for scenario in scenarios]
+    if len(inputs) > 1:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            languages = executor.map(multilingual_manager.detect_language, inputs)
+            sentiments = executor.map(sentiment_analyzer.analyze_sentiment, inputs)
+            languages, sentiments = list(languages), list(sentiments)
+    else:
+        languages = [multilingual_manager.detect_language(text) for text in inputs]
+        sentiments = [sentiment_analyzer.analyze_sentiment(text) for text in inputs]
+    
+    for i, (scenario, language, sentiment) in enumerate(zip(scenarios, languages, sentiments), 1):
         print(f"\n🎬 Scenario {i}: {scenario['name']}")
         print(f"📝 Input: \"{scenario['input']}\"")
         
         # Step 1: Detect language
-        language = multilingual_manager.detect_language(scenario['input'])
         flag = multilingual_manager.supported_languages.get(language, {}).flag if language in multilingual_manager.supported_languages else "🏳️"
         print(f"🌍 Language: {flag} {language}")
         
         # Step 2: Analyze sentiment
-        sentiment = sentiment_analyzer.analyze_sentiment(scenario['input'])
         emoji = sentiment_analyzer.get_emotion_emoji(sentiment.emotion)
         print(f"🧠 Sentiment: {emoji} {sentiment.emotion} ({sentiment.polarity:.2f})")
         
@@ -182,7 +205,7 @@ def demo_integration():
         print(f"👋 Response: {greeting}")
         print(f"💬 Encouragement: {encouragement}")
         
-        time.sleep(2)
+        pause(2)
 
 def main():
     """Run the complete advanced features demo."""
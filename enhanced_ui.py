@@ -3,27 +3,379 @@ Enhanced UI Module for TalentScout
 Provides advanced styling, animations, and interactive elements
 """
 
+import html
+import json
+import re
+import threading
+import time
 import streamlit as st
-import plotly.graph_objects as go
-from typing import Dict, List
+import streamlit.components.v1 as components
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from rcssmin import cssmin
+except ImportError:  # rcssmin is optional; fall back to the regex minifier below
+    cssmin = None
+
+# Circumference of the r=15 completion ring in the metrics panel
+_RING_CIRCUMFERENCE = 2 * 3.14159 * 15
+
+_METRICS_BONUS_TIP = "<div class='tip-item bonus-tip'><span class='tip-icon'>⭐</span><span class='tip-text'>High-quality conversation detected! This candidate shows strong communication skills.</span></div>"
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_LEADING_ZERO_RE = re.compile(r'(?<![\w.])0\.(\d)')
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    if cssmin is not None:
+        return cssmin(css)
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_LEADING_ZERO_RE.sub(r'.\1', css)
+    return css.replace(';}', '}').replace(': ', ':').strip()
+
+@lru_cache(maxsize=1)
+def _lazy_plotly():
+    """Import plotly.graph_objects on first use; it adds ~150 ms to a cold start."""
+    import plotly.graph_objects as go
+    return go
+
+@lru_cache(maxsize=128)
+def _metric_card_html(title: str, value: str, icon: str, primary_color: str) -> str:
+    """Render a metric card; values usually repeat between reruns."""
+    return f"""
+        <div class="info-card" style="text-align: center;">
+            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
+            <div style="font-size: 1.5rem; font-weight: 600; color: {primary_color};">{value}</div>
+            <div style="font-size: 0.9rem; color: #666;">{title}</div>
+        </div>
+        """
+
+# (predicate(avg_sentiment, message_count, completion_rate), recommendation)
+_RECOMMENDATION_RULES = (
+    (lambda s, m, c: s < -0.1, "🤗 Provide more encouragement and support"),
+    (lambda s, m, c: m < 3, "💬 Encourage more detailed responses"),
+    (lambda s, m, c: c < 0.3, "🚀 Guide candidate through next steps"),
+    (lambda s, m, c: c > 0.8, "🎉 Almost done! Prepare for final questions"),
+)
+
+@lru_cache(maxsize=64)
+def _recommendations(avg_sentiment: float, message_count: int, completion_rate: float) -> Tuple[str, ...]:
+    """Recommendations for the given metrics; reruns with unchanged metrics hit the cache."""
+    return tuple(
+        message for applies, message in _RECOMMENDATION_RULES
+        if applies(avg_sentiment, message_count, completion_rate)
+    ) or ("✅ Conversation is flowing well!",)
+
+@lru_cache(maxsize=64)
+def _stage_indicator_html(stage_name: str, description: str, is_current: bool) -> str:
+    """Render a stage indicator card; the same few stages are redrawn every rerun."""
+    pulse_class = "pulse-animation" if is_current else ""
+    return f"""
+        <div class="stage-indicator {pulse_class}">
+            <div class="stage-title">{'🔄 ' if is_current else '✅ '}{stage_name}</div>
+            <div>{description}</div>
+        </div>
+        """
+
+# The metrics panel renders in its own iframe; tall enough for the stacked sidebar cards
+_METRICS_PANEL_HEIGHT = 980
+
+# Switches off every animation and transition; used for reduced-motion users
+_NO_MOTION_RULES = "*, *::before, *::after { animation: none !important; transition: none !important; }"
+
+# Floating help button; <details> toggles the menu without any script
+_FLOATING_HELP_HTML = """
+        <details class="floating-help-container">
+            <summary class="floating-help-button">
+                <span class="help-icon">❓</span>
+                <span class="help-text">Help</span>
+            </summary>
+
+            <div class="floating-help-menu">
+                <div class="help-item">
+                    <span class="help-item-icon">🚀</span>
+                    <span class="help-item-text">Getting Started</span>
+                </div>
+                <div class="help-item">
+                    <span class="help-item-icon">💬</span>
+                    <span class="help-item-text">Chat Tips</span>
+                </div>
+                <div class="help-item">
+                    <span class="help-item-icon">🌍</span>
+                    <span class="help-item-text">Languages</span>
+                </div>
+                <div class="help-item">
+                    <span class="help-item-icon">🔧</span>
+                    <span class="help-item-text">Settings</span>
+                </div>
+            </div>
+        </details>
+        """
+
+# Metric values before the first message, when the panel is a constant
+_EMPTY_METRICS_KEY = (0, 0.0, 0.0)
+
+# Live conversation metrics panel, filled in with str.format_map
+_METRICS_TEMPLATE = """
+        <div class="enhanced-interactive-metrics">
+            <div class="metrics-header">
+                <h3>📊 Live Conversation Analytics</h3>
+                <div class="metrics-status">
+                    {session_status}
+                </div>
+            </div>
+
+            <div class="metrics-cards-container">
+                <!-- Messages Metric with Pulsing Animation -->
+                <div class="enhanced-metric-card messages-card">
+                    <div class="metric-header">
+                        <div class="metric-icon-wrapper">
+                            <div class="metric-icon pulse-animation">💬</div>
+                            <div class="metric-pulse-ring"></div>
+                        </div>
+                        <div class="metric-badge animated-badge">{message_count}</div>
+                    </div>
+                    <div class="metric-body">
+                        <div class="metric-value">{message_count}</div>
+                        <div class="metric-label">Messages</div>
+                        <div class="metric-trend">
+                            {messages_trend}
+                        </div>
+                        <div class="metric-detail">
+                            {messages_detail}
+                        </div>
+                    </div>
+                </div>
+
+                <!-- Sentiment Metric with Bouncing Animation and Color Coding -->
+                <div class="enhanced-metric-card sentiment-card" style="border-left: 4px solid {sentiment_color};">
+                    <div class="metric-header">
+                        <div class="metric-icon-wrapper">
+                            <div class="metric-icon bounce-animation">{sentiment_emoji}</div>
+                            <div class="sentiment-aura" style="background: {sentiment_color}20;"></div>
+                        </div>
+                        <div class="metric-badge sentiment-badge" style="background: {sentiment_bg};">
+                            {avg_sentiment:+.2f}
+                        </div>
+                    </div>
+                    <div class="metric-body">
+                        <div class="metric-value" style="color: {sentiment_color};">{sentiment_text}</div>
+                        <div class="metric-label">Sentiment Analysis</div>
+                        <div class="metric-trend sentiment-trend" style="background: {sentiment_color}20; color: {sentiment_color};">
+                            {sentiment_trend}
+                        </div>
+                        <div class="sentiment-bar">
+                            <div class="sentiment-fill" style="width: {sentiment_fill}%; background: {sentiment_color};"></div>
+                        </div>
+                        <div class="metric-detail">
+                            {sentiment_detail}
+                        </div>
+                    </div>
+                </div>
+
+                <!-- Completion Metric with Complex Progress Indicators -->
+                <div class="enhanced-metric-card completion-card{completion_updating}">
+                    <div class="metric-header">
+                        <div class="metric-icon-wrapper">
+                            <div class="metric-icon rotate-animation">
+                                {completion_icon}
+                            </div>
+                            <div class="completion-ring">
+                                <svg class="progress-ring" width="40" height="40">
+                                    <circle class="progress-ring-circle" cx="20" cy="20" r="15"
+                                            style="stroke-dasharray: {ring_circumference};
+                                                   stroke-dashoffset: {ring_offset};">
+                                    </circle>
+                                </svg>
+                            </div>
+                        </div>
+                        <div class="metric-badge completion-badge" style="background: linear-gradient(45deg, {primary_color}, #45a049);">
+                            {completion_rate:.0%}
+                        </div>
+                    </div>
+                    <div class="metric-body">
+                        <div class="metric-value">{completion_rate:.0%}</div>
+                        <div class="metric-label">Application Progress</div>
+                        <div class="metric-trend completion-trend">
+                            {completion_trend}
+                        </div>
+                        <div class="complex-progress-bar">
+                            <div class="progress-track">
+                                <div class="progress-fill" style="width: {completion_width}%;">
+                                    <div class="progress-shine"></div>
+                                </div>
+                            </div>
+                            <div class="progress-markers">
+                                {progress_markers}
+                            </div>
+                        </div>
+                        <div class="metric-detail">
+                            {completion_detail}
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <!-- Interactive Tips and Trend Messages -->
+            <div class="interactive-tips-section">
+                <div class="tips-header">
+                    <span class="tips-icon pulse-animation">💡</span>
+                    <span class="tips-title">Smart Insights</span>
+                </div>
+                <div class="tips-content">
+                    <div class="tip-item primary-tip">
+                        <span class="tip-icon">{sentiment_tip_icon}</span>
+                        <span class="tip-text">
+                            {sentiment_tip}
+                        </span>
+                    </div>
+                    <div class="tip-item secondary-tip">
+                        <span class="tip-icon">{completion_tip_icon}</span>
+                        <span class="tip-text">
+                            {completion_tip}
+                        </span>
+                    </div>
+                    {bonus_tip}
+                </div>
+            </div>
+        </div>
+        """
+
 class EnhancedUI:
     """Enhanced UI components and styling for TalentScout."""
     
+    __slots__ = ('_css_html', '_css_script', '_metrics_style', '_local', '_marker_strips', '_empty_metrics_html')
+    
+    # Color palette
+    primary_color = "#4CAF50"
+    secondary_color = "#2196F3"
+    accent_color = "#FF9800"
+    success_color = "#4CAF50"
+    warning_color = "#FF9800"
+    error_color = "#F44336"
+    background_color = "#FAFAFA"
+    
+    # Metric labels keyed by threshold bins; bisect_left on the bounds picks the
+    # bin, so a value exactly on a bound falls in the lower bin (strict ">")
+    _SENTIMENT_BOUNDS = (-0.2, -0.1, 0, 0.1, 0.2, 0.3, 0.4)
+    _SENTIMENT_BINS = (
+        # (emoji, color, text, badge background, trend, detail)
+        ("😟", "#F44336", "Needs Support", "#F44336", "💪 Stay encouraged!", "Consider providing encouragement"),
+        ("😕", "#FF9800", "Concerned", "#FF9800", "💪 Stay encouraged!", "Consider providing encouragement"),
+        ("😐", "#FFC107", "Neutral", "#FFC107", "😐 Neutral tone", "Neutral conversation tone"),
+        ("😐", "#FFC107", "Neutral", "#FFC107", "😊 Positive flow", "Candidate seems comfortable"),
+        ("😊", "#8BC34A", "Positive", "#8BC34A", "👍 Great energy!", "Positive candidate experience"),
+        ("😄", "#4CAF50", "Very Positive", "#4CAF50", "👍 Great energy!", "Positive candidate experience"),
+        ("😄", "#4CAF50", "Very Positive", "#4CAF50", "🎉 Amazing vibes!", "Candidate is very enthusiastic"),
+        ("🤩", "#4CAF50", "Excellent", "linear-gradient(135deg, #4CAF50, #8BC34A)", "🎉 Amazing vibes!", "Candidate is very enthusiastic")
+    )
+    
+    # Indexed by (sentiment >= -0.1) + (sentiment > 0.2)
+    _SENTIMENT_TIPS = (
+        ("💪", "Consider providing more encouragement to boost candidate confidence."),
+        ("👍", "Conversation is flowing well. Keep the momentum going!"),
+        ("🎉", "Keep up the fantastic energy! The candidate is very engaged.")
+    )
+    
+    _MESSAGE_BOUNDS = (0, 3, 5, 8)
+    _MESSAGE_BINS = (
+        # (session status, trend, detail)
+        ("👋 Ready to Begin", "👋 Ready to Chat", "Waiting for first message"),
+        ("📝 Getting Started", "📝 Getting Started", "Building momentum"),
+        ("🔥 Active Session", "📝 Getting Started", "Building momentum"),
+        ("🔥 Active Session", "⚡ Active Chat", "Good conversation flow"),
+        ("🔥 Active Session", "🔥 Very Active!", "Excellent engagement")
+    )
+    
+    _COMPLETION_BOUNDS = (0, 0.2, 0.3, 0.5, 0.6, 0.8)
+    _COMPLETION_BINS = (
+        # (icon, trend, detail, tip icon, tip)
+        ("✨", "🌟 Ready to begin!", "Starting the journey", "🚀", "Building rapport. Take time to understand the candidate."),
+        ("✨", "🚀 Just getting started!", "Starting the journey", "🚀", "Building rapport. Take time to understand the candidate."),
+        ("✨", "🚀 Just getting started!", "Building candidate profile", "🚀", "Building rapport. Take time to understand the candidate."),
+        ("🚀", "⚡ Moving forward!", "Building candidate profile", "🚀", "Building rapport. Take time to understand the candidate."),
+        ("🚀", "⚡ Moving forward!", "Halfway through the process", "🎯", "Great progress! Continue with the structured flow."),
+        ("⚡", "🎯 Great progress!", "Halfway through the process", "🎯", "Great progress! Continue with the structured flow."),
+        ("🎯", "🏁 Almost finished!", "Final questions coming up!", "🏁", "Almost done! Prepare for final technical questions.")
+    )
+    
+    # Sentiment verdict badges for the detailed metrics view
+    _SENTIMENT_ALERT_BOUNDS = (-0.2, 0, 0.2)
+    _SENTIMENT_ALERTS = tuple(
+        f'<div class="sentiment-badge sentiment-badge-{kind}">{text}</div>'
+        for kind, text in (
+            ("error", "😟 Negative - Candidate may need support"),
+            ("warning", "😐 Neutral - Consider more encouragement"),
+            ("info", "😊 Positive - Good conversation flow"),
+            ("success", "😄 Very Positive - Great engagement!")
+        )
+    )
+    
     def __init__(self):
-        self.primary_color = "#4CAF50"
-        self.secondary_color = "#2196F3"
-        self.accent_color = "#FF9800"
-        self.success_color = "#4CAF50"
-        self.warning_color = "#FF9800"
-        self.error_color = "#F44336"
-        self.background_color = "#FAFAFA"
+        self._css_html = None
+        self._css_script = None
+        self._metrics_style = None
+        # Pending batch of HTML fragments; per thread, since sessions share this instance
+        self._local = threading.local()
         
-    def inject_custom_css(self):
-        """Inject comprehensive custom CSS for enhanced styling."""
-        css = f"""
-        <style>
+        # Completion marker strips, indexed by how many of the nine markers are active
+        self._marker_strips = [self._build_markers(active_count) for active_count in range(10)]
+        self._empty_metrics_html = self._render_metrics_html(*_EMPTY_METRICS_KEY)
+        
+    @staticmethod
+    def _build_markers(active_count: int) -> str:
+        """HTML for the nine completion markers with the first active_count highlighted."""
+        return "".join(
+            f'<div class="progress-marker {"active" if i < active_count else ""}" style="left: {i/8*100}%;"></div>'
+            for i in range(9)
+        )
+
+    def get_custom_css(self) -> str:
+        """Return the custom CSS block, building it on first use."""
+        if self._css_html is None:
+            self._css_html = f"<style>{minify_css(self._render_custom_css())}</style>"
+        return self._css_html
+    
+    def _stylesheet_script(self) -> str:
+        """Script that installs the stylesheet in the parent page's <head>."""
+        if self._css_script is None:
+            css = json.dumps(minify_css(self._render_custom_css())).replace('</', '<\\/')
+            self._css_script = f"""<script>
+        const doc = window.parent.document;
+        let sheet = doc.getElementById('talentscout-css');
+        if (!sheet) {{
+            sheet = doc.createElement('style');
+            sheet.id = 'talentscout-css';
+            doc.head.appendChild(sheet);
+        }}
+        sheet.textContent = {css};
+        </script>"""
+        return self._css_script
+    
+    def get_metrics_style(self) -> str:
+        """Return the <style> block for the metrics panel's iframe document."""
+        if self._metrics_style is None:
+            self._metrics_style = minify_css(f"""<style>
+        body {{ margin: 0; font-family: 'Inter', -apple-system, 'Segoe UI', sans-serif; }}
+        {self._metrics_css()}
+        </style>""")
+        return self._metrics_style
+
+    def _render_custom_css(self) -> str:
+        """Build the comprehensive custom CSS block for enhanced styling."""
+        return f"""
         /* Import Google Fonts */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
         
@@ -34,15 +386,6 @@ class EnhancedUI:
             min-height: 100vh;
         }}
         
-        /* Main Container */
-        .main-container {{
-            background: white;
-            border-radius: 20px;
-            padding: 2rem;
-            margin: 1rem;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.05);
-        }}
-        
         /* Header Styling */
         .app-header {{
             text-align: center;
@@ -51,7 +394,7 @@ class EnhancedUI:
             border-radius: 20px;
             color: white;
             margin-bottom: 2rem;
-            box-shadow: 0 10px 30px rgba(76, 175, 80, 0.3);
+            box-shadow: 0 10px 30px {self.primary_color}4d;
             position: relative;
             overflow: hidden;
         }}
@@ -64,7 +407,6 @@ class EnhancedUI:
             width: 200%;
             height: 200%;
             background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
-            animation: shimmer 3s ease-in-out infinite;
         }}
         
         .app-title {{
@@ -81,96 +423,7 @@ class EnhancedUI:
             opacity: 0.9;
         }}
         
-        /* Enhanced Chat Messages */
-        .chat-message {{
-            padding: 1.5rem;
-            border-radius: 20px;
-            margin: 1rem 0;
-            animation: slideIn 0.4s ease-out;
-            box-shadow: 0 8px 25px rgba(0,0,0,0.08);
-            position: relative;
-            transition: all 0.3s ease;
-        }}
-
-        .chat-message:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 12px 35px rgba(0,0,0,0.12);
-        }}
-
-        .user-message {{
-            background: linear-gradient(135deg, {self.secondary_color}, #1976D2);
-            color: white;
-            margin-left: 3rem;
-            border-bottom-right-radius: 8px;
-            position: relative;
-        }}
-
-        .user-message::before {{
-            content: '👤';
-            position: absolute;
-            left: -2.5rem;
-            top: 50%;
-            transform: translateY(-50%);
-            background: white;
-            border-radius: 50%;
-            width: 2rem;
-            height: 2rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 1rem;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-
-        .assistant-message {{
-            background: linear-gradient(135deg, #ffffff, #f8f9fa);
-            color: #333;
-            margin-right: 3rem;
-            border-bottom-left-radius: 8px;
-            border-left: 4px solid {self.primary_color};
-            position: relative;
-        }}
-
-        .assistant-message::before {{
-            content: '🤖';
-            position: absolute;
-            right: -2.5rem;
-            top: 50%;
-            transform: translateY(-50%);
-            background: {self.primary_color};
-            border-radius: 50%;
-            width: 2rem;
-            height: 2rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 1rem;
-            box-shadow: 0 4px 12px rgba(76, 175, 80, 0.3);
-        }}
-        
-        /* Progress Bar */
-        .progress-container {{
-            background: #f0f0f0;
-            border-radius: 25px;
-            padding: 5px;
-            margin: 1rem 0;
-            box-shadow: inset 0 2px 5px rgba(0,0,0,0.1);
-        }}
-        
-        .progress-bar {{
-            background: linear-gradient(90deg, {self.primary_color}, {self.secondary_color});
-            height: 20px;
-            border-radius: 20px;
-            transition: width 0.5s ease;
-            box-shadow: 0 2px 10px rgba(76, 175, 80, 0.3);
-        }}
-        
-        .progress-text {{
-            text-align: center;
-            font-weight: 600;
-            color: #555;
-            margin-top: 0.5rem;
-        }}
+        /* Progress bar rules live in _progress_css() */
         
         /* Stage Indicator */
         .stage-indicator {{
@@ -180,7 +433,7 @@ class EnhancedUI:
             border-left: 5px solid {self.primary_color};
             margin: 1rem 0;
             box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            transition: transform 0.2s ease;
+            transition: transform 0.2s ease, box-shadow 0.2s ease;
         }}
         
         .stage-indicator:hover {{
@@ -204,13 +457,13 @@ class EnhancedUI:
             padding: 0.75rem 2rem;
             font-weight: 600;
             font-size: 1rem;
-            transition: all 0.3s ease;
-            box-shadow: 0 5px 15px rgba(76, 175, 80, 0.3);
+            transition: transform 0.3s ease, box-shadow 0.3s ease;
+            box-shadow: 0 5px 15px {self.primary_color}4d;
         }}
         
         .stButton > button:hover {{
             transform: translateY(-2px);
-            box-shadow: 0 8px 25px rgba(76, 175, 80, 0.4);
+            box-shadow: 0 8px 25px {self.primary_color}66;
             background: linear-gradient(135deg, #45a049, {self.primary_color});
         }}
         
@@ -220,13 +473,13 @@ class EnhancedUI:
             border-radius: 15px;
             padding: 1rem;
             font-size: 1rem;
-            transition: all 0.3s ease;
+            transition: border-color 0.3s ease, box-shadow 0.3s ease;
             background: white;
         }}
         
         .stTextInput > div > div > input:focus {{
             border-color: {self.primary_color};
-            box-shadow: 0 0 0 3px rgba(76, 175, 80, 0.1);
+            box-shadow: 0 0 0 3px {self.primary_color}1a;
             outline: none;
         }}
         
@@ -238,24 +491,7 @@ class EnhancedUI:
             background: white;
         }}
         
-        /* Sidebar */
-        .css-1d391kg {{
-            background: #f8f9fa;
-            border-right: 1px solid #e9ecef;
-        }}
-        
         /* Enhanced Animations */
-        @keyframes slideIn {{
-            from {{
-                opacity: 0;
-                transform: translateY(20px);
-            }}
-            to {{
-                opacity: 1;
-                transform: translateY(0);
-            }}
-        }}
-
         @keyframes slideInLeft {{
             from {{
                 opacity: 0;
@@ -284,11 +520,6 @@ class EnhancedUI:
             100% {{ transform: scale(1); }}
         }}
 
-        @keyframes shimmer {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
-
         @keyframes bounce {{
             0%, 20%, 50%, 80%, 100% {{ transform: translateY(0); }}
             40% {{ transform: translateY(-10px); }}
@@ -308,22 +539,27 @@ class EnhancedUI:
 
         .pulse-animation {{
             animation: pulse 2s infinite;
+            will-change: transform;
         }}
 
         .bounce-animation {{
             animation: bounce 2s infinite;
+            will-change: transform;
         }}
 
         .fade-in-up {{
             animation: fadeInUp 0.6s ease-out;
+            will-change: transform, opacity;
         }}
 
         .slide-in-left {{
             animation: slideInLeft 0.5s ease-out;
+            will-change: transform, opacity;
         }}
 
         .slide-in-right {{
             animation: slideInRight 0.5s ease-out;
+            will-change: transform, opacity;
         }}
         
         /* Sentiment Indicators */
@@ -342,6 +578,17 @@ class EnhancedUI:
             font-weight: 500;
         }}
         
+        .sentiment-badge {{
+            padding: 0.75rem 1rem;
+            border-radius: 8px;
+            margin: 0.5rem 0;
+        }}
+        
+        .sentiment-badge-success {{ background: {self.success_color}1a; color: #1b5e20; }}
+        .sentiment-badge-info {{ background: {self.secondary_color}1a; color: #0d47a1; }}
+        .sentiment-badge-warning {{ background: {self.warning_color}1a; color: #8a4b00; }}
+        .sentiment-badge-error {{ background: {self.error_color}1a; color: #b71c1c; }}
+        
         /* Cards */
         .info-card {{
             background: white;
@@ -350,7 +597,7 @@ class EnhancedUI:
             margin: 1rem 0;
             box-shadow: 0 5px 15px rgba(0,0,0,0.1);
             border-left: 4px solid {self.accent_color};
-            transition: transform 0.2s ease;
+            transition: transform 0.2s ease, box-shadow 0.2s ease;
         }}
         
         .info-card:hover {{
@@ -358,94 +605,108 @@ class EnhancedUI:
             box-shadow: 0 10px 30px rgba(0,0,0,0.15);
         }}
         
-        /* Loading Spinner */
-        .loading-spinner {{
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid {self.primary_color};
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 20px auto;
+        /* Read-only stat row (detailed metrics) */
+        .stat-grid {{
+            display: grid;
+            grid-template-columns: repeat(3, 1fr);
+            gap: 1rem;
+            margin-bottom: 1rem;
         }}
         
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
+        .stat-label {{
+            font-size: 0.875rem;
+            color: #666;
         }}
         
-        /* Responsive Design */
-        @media (max-width: 768px) {{
+        .stat-value {{
+            font-size: 1.75rem;
+            font-weight: 600;
+        }}
+        
+        /* Tech Stack Chips */
+        .tech-chips-title {{
+            font-weight: 600;
+            color: {self.primary_color};
+            margin-bottom: 0.5rem;
+        }}
+        
+        .tech-chips {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.5rem;
+            margin-bottom: 1rem;
+        }}
+        
+        .tech-chip {{
+            background: {self.primary_color};
+            color: white;
+            border-radius: 15px;
+            padding: 0.3rem 0.8rem;
+            font-size: 0.9rem;
+            font-weight: 500;
+        }}
+        
+        /* Loading Spinner */
+        .loading-spinner {{
+            border: 4px solid #f3f3f3;
+            border-top: 4px solid {self.primary_color};
+            border-radius: 50%;
+            width: 40px;
+            height: 40px;
+            animation: spin 1s linear infinite;
+            will-change: transform;
+            margin: 20px auto;
+        }}
+        
+        @keyframes spin {{
+            0% {{ transform: rotate(0deg); }}
+            100% {{ transform: rotate(360deg); }}
+        }}
+        
+        /* Responsive Design */
+        @media (max-width: 768px) {{
             .app-title {{
                 font-size: 2rem;
             }}
-            
-            .chat-message {{
-                margin-left: 0.5rem;
-                margin-right: 0.5rem;
-            }}
-            
-            .main-container {{
-                margin: 0.5rem;
-                padding: 1rem;
-            }}
         }}
-        </style>
+
+        {self._header_css()}
+        {self._progress_css()}
+        {self._welcome_css()}
+        {self._help_css()}
+
+        @media (prefers-reduced-motion: reduce) {{
+            {_NO_MOTION_RULES}
+        }}
         """
-        st.markdown(css, unsafe_allow_html=True)
-    
-    def create_animated_header(self, title: str, subtitle: str):
-        """Create enhanced animated header with interactive elements."""
-        header_html = f"""
-        <div class="app-header fade-in-up">
-            <div class="header-content">
-                <div class="logo-container bounce-animation">
-                    <div class="logo">🚀</div>
-                </div>
-                <h1 class="app-title">{title}</h1>
-                <p class="app-subtitle">{subtitle}</p>
-                <div class="header-features">
-                    <div class="feature-badge slide-in-left">
-                        <span class="feature-icon">🧠</span>
-                        <span>AI-Powered</span>
-                    </div>
-                    <div class="feature-badge slide-in-right">
-                        <span class="feature-icon">🌍</span>
-                        <span>Multilingual</span>
-                    </div>
-                    <div class="feature-badge fade-in-up">
-                        <span class="feature-icon">⚡</span>
-                        <span>Real-time</span>
-                    </div>
-                </div>
-            </div>
-        </div>
 
-        <style>
-        .header-content {{
+    def _header_css(self) -> str:
+        """CSS rules for the animated header."""
+        return """/* Animated Header */
+        .header-content {
             position: relative;
             z-index: 2;
-        }}
+        }
 
-        .logo-container {{
+        .logo-container {
             margin-bottom: 1rem;
-        }}
+        }
 
-        .logo {{
+        .logo {
             font-size: 3rem;
             display: inline-block;
             filter: drop-shadow(0 4px 8px rgba(0,0,0,0.3));
-        }}
+        }
 
-        .header-features {{
+        .header-features {
             display: flex;
             justify-content: center;
             gap: 1rem;
             margin-top: 1.5rem;
             flex-wrap: wrap;
-        }}
+        }
 
-        .feature-badge {{
+        .feature-badge {
             background: rgba(255,255,255,0.2);
             padding: 0.5rem 1rem;
             border-radius: 25px;
@@ -456,41 +717,21 @@ class EnhancedUI:
             font-weight: 500;
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255,255,255,0.3);
-            transition: all 0.3s ease;
-        }}
+            transition: transform 0.3s ease, background 0.3s ease;
+        }
 
-        .feature-badge:hover {{
+        .feature-badge:hover {
             background: rgba(255,255,255,0.3);
             transform: translateY(-2px);
-        }}
+        }
 
-        .feature-icon {{
+        .feature-icon {
             font-size: 1.1rem;
-        }}
-        </style>
-        """
-        st.markdown(header_html, unsafe_allow_html=True)
-    
-    def create_progress_bar(self, progress: float, stage_name: str):
-        """Create clean animated progress bar without step indicators."""
-
-        progress_html = f"""
-        <div class="clean-progress-container fade-in-up">
-            <div class="progress-header">
-                <h3 style="margin: 0; color: {self.primary_color};">Progress</h3>
-                <span class="progress-percentage">{progress * 100:.0f}%</span>
-            </div>
-            <div class="progress-container">
-                <div class="progress-bar" style="width: {progress * 100}%">
-                    <div class="progress-shine"></div>
-                </div>
-            </div>
-            <div class="progress-text">
-                <strong>{stage_name}</strong>
-            </div>
-        </div>
+        }"""
 
-        <style>
+    def _progress_css(self) -> str:
+        """CSS rules for the sidebar progress bar."""
+        return f"""/* Clean Progress Bar */
         .clean-progress-container {{
             background: white;
             padding: 1.5rem;
@@ -527,7 +768,7 @@ class EnhancedUI:
             height: 20px;
             border-radius: 20px;
             transition: width 0.5s ease;
-            box-shadow: 0 2px 10px rgba(76, 175, 80, 0.3);
+            box-shadow: 0 2px 10px {self.primary_color}4d;
             position: relative;
             overflow: hidden;
         }}
@@ -535,16 +776,22 @@ class EnhancedUI:
         .progress-shine {{
             position: absolute;
             top: 0;
-            left: -100%;
+            left: 0;
             width: 100%;
             height: 100%;
+            transform: translateX(-100%);
             background: linear-gradient(90deg, transparent, rgba(255,255,255,0.4), transparent);
-            animation: shine 2s infinite;
+        }}
+
+        /* Shine only right after the progress changes, not while idle */
+        .progress-bar[data-active="true"] .progress-shine {{
+            animation: shine 2s 1;
+            will-change: transform;
         }}
 
         @keyframes shine {{
-            0% {{ left: -100%; }}
-            100% {{ left: 100%; }}
+            0% {{ transform: translateX(-100%); }}
+            100% {{ transform: translateX(100%); }}
         }}
 
         .progress-text {{
@@ -553,243 +800,112 @@ class EnhancedUI:
             color: #555;
             margin-top: 0.5rem;
             font-size: 1rem;
+        }}"""
+
+    def _welcome_css(self) -> str:
+        """CSS rules for the simple welcome card."""
+        return f"""/* Simple Welcome */
+        .simple-welcome {{
+            background: white;
+            border-radius: 15px;
+            padding: 1.5rem;
+            margin: 1rem 0;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
+            border-left: 4px solid {self.primary_color};
         }}
-        </style>
-        """
-        st.markdown(progress_html, unsafe_allow_html=True)
-    
-    def create_stage_indicator(self, stage_name: str, description: str, is_current: bool = False):
-        """Create stage indicator card."""
-        pulse_class = "pulse-animation" if is_current else ""
-        indicator_html = f"""
-        <div class="stage-indicator {pulse_class}">
-            <div class="stage-title">{'🔄 ' if is_current else '✅ '}{stage_name}</div>
-            <div>{description}</div>
-        </div>
-        """
-        st.markdown(indicator_html, unsafe_allow_html=True)
-    
-    def create_sentiment_display(self, sentiment_score: float, emotion: str):
-        """Create sentiment visualization."""
-        if sentiment_score > 0.2:
-            sentiment_class = "sentiment-positive"
-            emoji = "😊"
-        elif sentiment_score < -0.2:
-            sentiment_class = "sentiment-negative"
-            emoji = "😔"
-        else:
-            sentiment_class = "sentiment-neutral"
-            emoji = "😐"
-        
-        sentiment_html = f"""
-        <div class="info-card">
-            <div style="display: flex; align-items: center; gap: 10px;">
-                <span style="font-size: 1.5rem;">{emoji}</span>
-                <div>
-                    <div class="{sentiment_class}">Sentiment: {emotion.title()}</div>
-                    <div style="font-size: 0.9rem; color: #666;">
-                        Score: {sentiment_score:.2f}
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
-        st.markdown(sentiment_html, unsafe_allow_html=True)
-    
-    def create_tech_stack_visualization(self, tech_stack: List[str]):
-        """Create interactive tech stack visualization."""
-        if not tech_stack:
-            return
-        
-        # Create a simple bar chart
-        fig = go.Figure(data=[
-            go.Bar(
-                x=tech_stack,
-                y=[1] * len(tech_stack),
-                marker_color=self.primary_color,
-                text=tech_stack,
-                textposition='auto',
-            )
-        ])
-        
-        fig.update_layout(
-            title="Your Technical Skills",
-            xaxis_title="Technologies",
-            yaxis_title="Proficiency",
-            showlegend=False,
-            height=300,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    def create_enhanced_conversation_metrics(self, metrics: Dict):
-        """Create enhanced interactive conversation metrics with all animations and features."""
 
-        # Get metrics values
-        message_count = metrics.get('message_count', 0)
-        avg_sentiment = metrics.get('avg_sentiment', 0.0)
-        completion_rate = metrics.get('completion_rate', 0.0)
+        .welcome-content {{
+            text-align: center;
+        }}
 
-        # Determine sentiment emoji, color, and detailed analysis
-        if avg_sentiment > 0.4:
-            sentiment_emoji = "🤩"
-            sentiment_color = "#4CAF50"
-            sentiment_text = "Excellent"
-            sentiment_bg = "linear-gradient(135deg, #4CAF50, #8BC34A)"
-        elif avg_sentiment > 0.2:
-            sentiment_emoji = "😄"
-            sentiment_color = "#4CAF50"
-            sentiment_text = "Very Positive"
-            sentiment_bg = "#4CAF50"
-        elif avg_sentiment > 0.1:
-            sentiment_emoji = "😊"
-            sentiment_color = "#8BC34A"
-            sentiment_text = "Positive"
-            sentiment_bg = "#8BC34A"
-        elif avg_sentiment > -0.1:
-            sentiment_emoji = "😐"
-            sentiment_color = "#FFC107"
-            sentiment_text = "Neutral"
-            sentiment_bg = "#FFC107"
-        elif avg_sentiment > -0.2:
-            sentiment_emoji = "😕"
-            sentiment_color = "#FF9800"
-            sentiment_text = "Concerned"
-            sentiment_bg = "#FF9800"
-        else:
-            sentiment_emoji = "😟"
-            sentiment_color = "#F44336"
-            sentiment_text = "Needs Support"
-            sentiment_bg = "#F44336"
+        .welcome-content h3 {{
+            color: {self.primary_color};
+            margin: 0 0 0.5rem 0;
+            font-size: 1.3rem;
+        }}
 
-        # Create enhanced interactive metrics with all features
-        metrics_html = f"""
-        <div class="enhanced-interactive-metrics">
-            <div class="metrics-header">
-                <h3>📊 Live Conversation Analytics</h3>
-                <div class="metrics-status">
-                    {"🔥 Active Session" if message_count > 3 else "📝 Getting Started" if message_count > 0 else "👋 Ready to Begin"}
-                </div>
-            </div>
+        .welcome-content p {{
+            color: #6c757d;
+            margin: 0;
+            font-size: 1rem;
+        }}"""
 
-            <div class="metrics-cards-container">
-                <!-- Messages Metric with Pulsing Animation -->
-                <div class="enhanced-metric-card messages-card">
-                    <div class="metric-header">
-                        <div class="metric-icon-wrapper">
-                            <div class="metric-icon pulse-animation">💬</div>
-                            <div class="metric-pulse-ring"></div>
-                        </div>
-                        <div class="metric-badge animated-badge">{message_count}</div>
-                    </div>
-                    <div class="metric-body">
-                        <div class="metric-value">{message_count}</div>
-                        <div class="metric-label">Messages</div>
-                        <div class="metric-trend">
-                            {"🔥 Very Active!" if message_count > 8 else "⚡ Active Chat" if message_count > 5 else "📝 Getting Started" if message_count > 0 else "👋 Ready to Chat"}
-                        </div>
-                        <div class="metric-detail">
-                            {"Excellent engagement" if message_count > 8 else "Good conversation flow" if message_count > 5 else "Building momentum" if message_count > 0 else "Waiting for first message"}
-                        </div>
-                    </div>
-                </div>
+    def _help_css(self) -> str:
+        """CSS rules for the floating help button."""
+        return f"""/* Floating Help */
+        .floating-help-container {{
+            position: fixed;
+            bottom: 2rem;
+            right: 2rem;
+            z-index: 1000;
+        }}
 
-                <!-- Sentiment Metric with Bouncing Animation and Color Coding -->
-                <div class="enhanced-metric-card sentiment-card" style="border-left: 4px solid {sentiment_color};">
-                    <div class="metric-header">
-                        <div class="metric-icon-wrapper">
-                            <div class="metric-icon bounce-animation">{sentiment_emoji}</div>
-                            <div class="sentiment-aura" style="background: {sentiment_color}20;"></div>
-                        </div>
-                        <div class="metric-badge sentiment-badge" style="background: {sentiment_bg};">
-                            {avg_sentiment:+.2f}
-                        </div>
-                    </div>
-                    <div class="metric-body">
-                        <div class="metric-value" style="color: {sentiment_color};">{sentiment_text}</div>
-                        <div class="metric-label">Sentiment Analysis</div>
-                        <div class="metric-trend sentiment-trend" style="background: {sentiment_color}20; color: {sentiment_color};">
-                            {"🎉 Amazing vibes!" if avg_sentiment > 0.3 else "👍 Great energy!" if avg_sentiment > 0.1 else "😊 Positive flow" if avg_sentiment > 0 else "😐 Neutral tone" if avg_sentiment > -0.1 else "💪 Stay encouraged!"}
-                        </div>
-                        <div class="sentiment-bar">
-                            <div class="sentiment-fill" style="width: {min(abs(avg_sentiment) * 100, 100)}%; background: {sentiment_color};"></div>
-                        </div>
-                        <div class="metric-detail">
-                            {"Candidate is very enthusiastic" if avg_sentiment > 0.3 else "Positive candidate experience" if avg_sentiment > 0.1 else "Candidate seems comfortable" if avg_sentiment > 0 else "Neutral conversation tone" if avg_sentiment > -0.1 else "Consider providing encouragement"}
-                        </div>
-                    </div>
-                </div>
+        .floating-help-button {{
+            background: linear-gradient(135deg, {self.primary_color}, #45a049);
+            color: white;
+            border-radius: 50px;
+            padding: 1rem 1.5rem;
+            box-shadow: 0 8px 25px {self.primary_color}4d;
+            cursor: pointer;
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+            transition: transform 0.3s ease, box-shadow 0.3s ease;
+            font-weight: 600;
+            list-style: none;
+        }}
 
-                <!-- Completion Metric with Complex Progress Indicators -->
-                <div class="enhanced-metric-card completion-card">
-                    <div class="metric-header">
-                        <div class="metric-icon-wrapper">
-                            <div class="metric-icon rotate-animation">
-                                {"🎯" if completion_rate > 0.8 else "⚡" if completion_rate > 0.6 else "🚀" if completion_rate > 0.3 else "✨"}
-                            </div>
-                            <div class="completion-ring">
-                                <svg class="progress-ring" width="40" height="40">
-                                    <circle class="progress-ring-circle" cx="20" cy="20" r="15"
-                                            style="stroke-dasharray: {2 * 3.14159 * 15};
-                                                   stroke-dashoffset: {2 * 3.14159 * 15 * (1 - completion_rate)};">
-                                    </circle>
-                                </svg>
-                            </div>
-                        </div>
-                        <div class="metric-badge completion-badge" style="background: linear-gradient(45deg, {self.primary_color}, #45a049);">
-                            {completion_rate:.0%}
-                        </div>
-                    </div>
-                    <div class="metric-body">
-                        <div class="metric-value">{completion_rate:.0%}</div>
-                        <div class="metric-label">Application Progress</div>
-                        <div class="metric-trend completion-trend">
-                            {"🏁 Almost finished!" if completion_rate > 0.8 else "🎯 Great progress!" if completion_rate > 0.6 else "⚡ Moving forward!" if completion_rate > 0.3 else "🚀 Just getting started!" if completion_rate > 0 else "🌟 Ready to begin!"}
-                        </div>
-                        <div class="complex-progress-bar">
-                            <div class="progress-track">
-                                <div class="progress-fill" style="width: {completion_rate * 100}%;">
-                                    <div class="progress-shine"></div>
-                                </div>
-                            </div>
-                            <div class="progress-markers">
-                                {"".join([f'<div class="progress-marker {"active" if i/8 <= completion_rate else ""}" style="left: {i/8*100}%;"></div>' for i in range(9)])}
-                            </div>
-                        </div>
-                        <div class="metric-detail">
-                            {"Final questions coming up!" if completion_rate > 0.8 else "Halfway through the process" if completion_rate > 0.5 else "Building candidate profile" if completion_rate > 0.2 else "Starting the journey"}
-                        </div>
-                    </div>
-                </div>
-            </div>
+        .floating-help-button::-webkit-details-marker {{
+            display: none;
+        }}
 
-            <!-- Interactive Tips and Trend Messages -->
-            <div class="interactive-tips-section">
-                <div class="tips-header">
-                    <span class="tips-icon pulse-animation">💡</span>
-                    <span class="tips-title">Smart Insights</span>
-                </div>
-                <div class="tips-content">
-                    <div class="tip-item primary-tip">
-                        <span class="tip-icon">{"🎉" if avg_sentiment > 0.2 else "💪" if avg_sentiment < -0.1 else "👍"}</span>
-                        <span class="tip-text">
-                            {"Keep up the fantastic energy! The candidate is very engaged." if avg_sentiment > 0.2 else "Consider providing more encouragement to boost candidate confidence." if avg_sentiment < -0.1 else "Conversation is flowing well. Keep the momentum going!"}
-                        </span>
-                    </div>
-                    <div class="tip-item secondary-tip">
-                        <span class="tip-icon">{"🏁" if completion_rate > 0.8 else "🎯" if completion_rate > 0.5 else "🚀"}</span>
-                        <span class="tip-text">
-                            {"Almost done! Prepare for final technical questions." if completion_rate > 0.8 else "Great progress! Continue with the structured flow." if completion_rate > 0.5 else "Building rapport. Take time to understand the candidate."}
-                        </span>
-                    </div>
-                    {"<div class='tip-item bonus-tip'><span class='tip-icon'>⭐</span><span class='tip-text'>High-quality conversation detected! This candidate shows strong communication skills.</span></div>" if message_count > 6 and avg_sentiment > 0.1 else ""}
-                </div>
-            </div>
-        </div>
+        .floating-help-button:hover {{
+            transform: translateY(-3px);
+            box-shadow: 0 12px 35px {self.primary_color}66;
+        }}
+
+        .help-icon {{
+            font-size: 1.2rem;
+        }}
+
+        .floating-help-menu {{
+            position: absolute;
+            bottom: 100%;
+            right: 0;
+            background: white;
+            border-radius: 15px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+            padding: 1rem;
+            margin-bottom: 1rem;
+            min-width: 200px;
+        }}
+
+        .help-item {{
+            display: flex;
+            align-items: center;
+            gap: 0.75rem;
+            padding: 0.75rem;
+            border-radius: 10px;
+            cursor: pointer;
+            transition: background 0.2s ease;
+        }}
+
+        .help-item:hover {{
+            background: #f8f9fa;
+        }}
+
+        .help-item-icon {{
+            font-size: 1.1rem;
+        }}
+
+        .help-item-text {{
+            font-weight: 500;
+            color: #333;
+        }}"""
 
-        <style>
+    def _metrics_css(self) -> str:
+        """CSS rules for the live conversation metrics panel."""
+        return f"""/* Live Conversation Metrics */
         .enhanced-interactive-metrics {{
             background: linear-gradient(135deg, #f8f9fa 0%, #ffffff 100%);
             border-radius: 20px;
@@ -808,8 +924,7 @@ class EnhancedUI:
             left: -50%;
             width: 200%;
             height: 200%;
-            background: radial-gradient(circle, rgba(76,175,80,0.05) 0%, transparent 70%);
-            animation: shimmer 4s ease-in-out infinite;
+            background: radial-gradient(circle, {self.primary_color}0d 0%, transparent 70%);
         }}
 
         .metrics-header {{
@@ -850,14 +965,18 @@ class EnhancedUI:
             border-radius: 15px;
             padding: 1.2rem;
             box-shadow: 0 5px 20px rgba(0,0,0,0.08);
-            transition: all 0.3s ease;
+            transition: transform 0.3s ease, box-shadow 0.3s ease;
             position: relative;
             overflow: hidden;
+            /* Skip layout and paint for cards scrolled out of the panel */
+            content-visibility: auto;
+            contain-intrinsic-size: auto 200px;
         }}
 
         .enhanced-metric-card:hover {{
             transform: translateY(-3px);
             box-shadow: 0 10px 30px rgba(0,0,0,0.15);
+            will-change: transform;
         }}
 
         .metric-header {{
@@ -887,6 +1006,7 @@ class EnhancedUI:
             border: 2px solid {self.primary_color}40;
             border-radius: 50%;
             animation: pulse-ring 2s infinite;
+            will-change: transform, opacity;
         }}
 
         .sentiment-aura {{
@@ -895,6 +1015,7 @@ class EnhancedUI:
             height: 3rem;
             border-radius: 50%;
             animation: aura-glow 3s infinite;
+            will-change: transform, opacity;
         }}
 
         .completion-ring {{
@@ -921,11 +1042,12 @@ class EnhancedUI:
             padding: 0.3rem 0.8rem;
             font-size: 0.8rem;
             font-weight: bold;
-            box-shadow: 0 3px 10px rgba(76,175,80,0.3);
+            box-shadow: 0 3px 10px {self.primary_color}4d;
         }}
 
         .animated-badge {{
             animation: badge-bounce 2s infinite;
+            will-change: transform;
         }}
 
         .metric-body {{
@@ -993,14 +1115,22 @@ class EnhancedUI:
             overflow: hidden;
         }}
 
-        .progress-shine {{
+        .complex-progress-bar .progress-shine {{
             position: absolute;
             top: 0;
-            left: -100%;
+            left: 0;
             width: 100%;
             height: 100%;
+            transform: translateX(-100%);
             background: linear-gradient(90deg, transparent, rgba(255,255,255,0.6), transparent);
-            animation: shine 2s infinite;
+            animation: shine 2s 1;
+            animation-play-state: paused;
+        }}
+
+        /* Only the card whose value just changed runs its shine */
+        .enhanced-metric-card.updating .progress-shine {{
+            animation-play-state: running;
+            will-change: transform;
         }}
 
         .progress-markers {{
@@ -1033,12 +1163,14 @@ class EnhancedUI:
         }}
 
         .interactive-tips-section {{
-            background: linear-gradient(135deg, rgba(76,175,80,0.1), rgba(33,150,243,0.1));
+            background: linear-gradient(135deg, {self.primary_color}1a, {self.secondary_color}1a);
             border-radius: 15px;
             padding: 1rem;
             border-left: 4px solid {self.primary_color};
             position: relative;
             z-index: 2;
+            content-visibility: auto;
+            contain-intrinsic-size: auto 180px;
         }}
 
         .tips-header {{
@@ -1074,15 +1206,15 @@ class EnhancedUI:
         }}
 
         .primary-tip {{
-            background: rgba(76,175,80,0.1);
+            background: {self.primary_color}1a;
         }}
 
         .secondary-tip {{
-            background: rgba(33,150,243,0.1);
+            background: {self.secondary_color}1a;
         }}
 
         .bonus-tip {{
-            background: linear-gradient(135deg, rgba(255,193,7,0.2), rgba(255,152,0,0.2));
+            background: linear-gradient(135deg, rgba(255,193,7,0.2), {self.accent_color}33);
             border: 1px solid rgba(255,193,7,0.3);
         }}
 
@@ -1131,31 +1263,226 @@ class EnhancedUI:
             50% {{ transform: scale(1.05); }}
         }}
 
-        @keyframes shimmer {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
-
         @keyframes shine {{
-            0% {{ left: -100%; }}
-            100% {{ left: 100%; }}
+            0% {{ transform: translateX(-100%); }}
+            100% {{ transform: translateX(100%); }}
         }}
 
         .pulse-animation {{
             animation: pulse-animation 2s infinite;
+            will-change: transform;
         }}
 
         .bounce-animation {{
             animation: bounce-animation 2s infinite;
+            will-change: transform;
         }}
 
         .rotate-animation {{
             animation: rotate-animation 3s linear infinite;
+            will-change: transform;
         }}
-        </style>
+
+        @media (prefers-reduced-motion: reduce) {{
+            {_NO_MOTION_RULES}
+        }}"""
+
+    def begin_batch(self):
+        """Collect HTML from the create_* helpers until flush_batch() is called."""
+        self._local.batch = []
+    
+    def flush_batch(self):
+        """Emit all HTML collected since begin_batch() as a single markdown element."""
+        batch = getattr(self._local, 'batch', None)
+        self._local.batch = None
+        if batch:
+            st.markdown("".join(batch), unsafe_allow_html=True)
+    
+    def _emit(self, html_fragment: str):
+        """Send an HTML fragment to the page, or queue it while batching."""
+        batch = getattr(self._local, 'batch', None)
+        if batch is None:
+            st.markdown(html_fragment, unsafe_allow_html=True)
+        else:
+            batch.append(html_fragment)
+
+    def inject_custom_css(self):
+        """Inject comprehensive custom CSS for enhanced styling."""
+        self._emit(self.get_custom_css())
+    
+    def inject_stylesheet_once(self):
+        """Install the stylesheet in the page <head> once per session."""
+        # Unlike st.markdown output, a <head> style survives reruns
+        if st.session_state.get('_css_injected'):
+            return
+        components.html(self._stylesheet_script(), height=0)
+        st.session_state._css_injected = True
+    
+    def create_animated_header(self, title: str, subtitle: str):
+        """Create enhanced animated header with interactive elements."""
+        header_html = f"""
+        <div class="app-header fade-in-up">
+            <div class="header-content">
+                <div class="logo-container bounce-animation">
+                    <div class="logo">🚀</div>
+                </div>
+                <h1 class="app-title">{title}</h1>
+                <p class="app-subtitle">{subtitle}</p>
+                <div class="header-features">
+                    <div class="feature-badge slide-in-left">
+                        <span class="feature-icon">🧠</span>
+                        <span>AI-Powered</span>
+                    </div>
+                    <div class="feature-badge slide-in-right">
+                        <span class="feature-icon">🌍</span>
+                        <span>Multilingual</span>
+                    </div>
+                    <div class="feature-badge fade-in-up">
+                        <span class="feature-icon">⚡</span>
+                        <span>Real-time</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """
+        self._emit(header_html)
+    
+    def create_progress_bar(self, progress: float, stage_name: str):
+        """Create clean animated progress bar without step indicators."""
+        # Play the shine for two seconds after the progress moves
+        now = time.monotonic()
+        last_progress, changed_at = st.session_state.get('_progress_shine', (None, 0.0))
+        if progress != last_progress:
+            changed_at = now
+            st.session_state._progress_shine = (progress, changed_at)
+        active = "true" if now - changed_at < 2 else "false"
+
+        progress_html = f"""
+        <div class="clean-progress-container fade-in-up">
+            <div class="progress-header">
+                <h3 style="margin: 0; color: {self.primary_color};">Progress</h3>
+                <span class="progress-percentage">{progress * 100:.0f}%</span>
+            </div>
+            <div class="progress-container">
+                <div class="progress-bar" data-active="{active}" style="width: {progress * 100}%">
+                    <div class="progress-shine"></div>
+                </div>
+            </div>
+            <div class="progress-text">
+                <strong>{stage_name}</strong>
+            </div>
+        </div>
+        """
+        self._emit(progress_html)
+    
+    def create_stage_indicator(self, stage_name: str, description: str, is_current: bool = False):
+        """Create stage indicator card."""
+        self._emit(_stage_indicator_html(stage_name, description, is_current))
+    
+    def create_sentiment_display(self, sentiment_score: float, emotion: str):
+        """Create sentiment visualization."""
+        if sentiment_score > 0.2:
+            sentiment_class = "sentiment-positive"
+            emoji = "😊"
+        elif sentiment_score < -0.2:
+            sentiment_class = "sentiment-negative"
+            emoji = "😔"
+        else:
+            sentiment_class = "sentiment-neutral"
+            emoji = "😐"
+        
+        sentiment_html = f"""
+        <div class="info-card">
+            <div style="display: flex; align-items: center; gap: 10px;">
+                <span style="font-size: 1.5rem;">{emoji}</span>
+                <div>
+                    <div class="{sentiment_class}">Sentiment: {emotion.title()}</div>
+                    <div style="font-size: 0.9rem; color: #666;">
+                        Score: {sentiment_score:.2f}
+                    </div>
+                </div>
+            </div>
+        </div>
         """
+        self._emit(sentiment_html)
+    
+    def create_tech_stack_visualization(self, tech_stack: List[str]):
+        """Show the candidate's tech stack as a row of chips."""
+        if not tech_stack:
+            return
+        
+        chips = "".join(f'<span class="tech-chip">{html.escape(tech)}</span>' for tech in tech_stack)
+        self._emit(f'<div class="tech-chips-title">Your Technical Skills</div><div class="tech-chips">{chips}</div>')
+    
+    def create_enhanced_conversation_metrics(self, metrics: Dict):
+        """Create enhanced interactive conversation metrics with all animations and features."""
+
+        # Bind the metrics values once; everything below uses the locals
+        get = metrics.get
+        message_count, avg_sentiment, completion_rate = (
+            get('message_count', 0), get('avg_sentiment', 0.0), get('completion_rate', 0.0)
+        )
+
+        # Before the first message the panel is always the same; otherwise
+        # reruns with unchanged metrics reuse the last rendered panel
+        metrics_key = (message_count, avg_sentiment, completion_rate)
+        if metrics_key == _EMPTY_METRICS_KEY:
+            metrics_html = self._empty_metrics_html
+        else:
+            last_metrics = st.session_state.get('_last_metrics')
+            if last_metrics is not None and last_metrics[0] == metrics_key:
+                metrics_html = last_metrics[1]
+            else:
+                # Only shine the completion bar when the completion rate moved
+                updating = last_metrics is not None and last_metrics[0][2] != completion_rate
+                metrics_html = self._render_metrics_html(message_count, avg_sentiment, completion_rate, updating)
+                st.session_state._last_metrics = (metrics_key, metrics_html)
+
+        # Its own document, so the parent page doesn't re-lay out this subtree on reruns
+        components.html(metrics_html, height=_METRICS_PANEL_HEIGHT, scrolling=True)
+
+    def _render_metrics_html(self, message_count: int, avg_sentiment: float, completion_rate: float,
+                             updating: bool = False) -> str:
+        """Build the metrics panel document for the given values."""
+        # Look up every threshold-dependent label in one step per metric
+        (sentiment_emoji, sentiment_color, sentiment_text, sentiment_bg,
+         sentiment_trend, sentiment_detail) = self._SENTIMENT_BINS[bisect_left(self._SENTIMENT_BOUNDS, avg_sentiment)]
+        session_status, messages_trend, messages_detail = self._MESSAGE_BINS[bisect_left(self._MESSAGE_BOUNDS, message_count)]
+        (completion_icon, completion_trend, completion_detail,
+         completion_tip_icon, completion_tip) = self._COMPLETION_BINS[bisect_left(self._COMPLETION_BOUNDS, completion_rate)]
+        sentiment_tip_icon, sentiment_tip = self._SENTIMENT_TIPS[(avg_sentiment >= -0.1) + (avg_sentiment > 0.2)]
 
-        st.markdown(metrics_html, unsafe_allow_html=True)
+        # Create enhanced interactive metrics with all features
+        metrics_html = _METRICS_TEMPLATE.format_map({
+            'primary_color': self.primary_color,
+            'message_count': message_count,
+            'avg_sentiment': avg_sentiment,
+            'completion_rate': completion_rate,
+            'sentiment_emoji': sentiment_emoji,
+            'sentiment_color': sentiment_color,
+            'sentiment_text': sentiment_text,
+            'sentiment_bg': sentiment_bg,
+            'sentiment_trend': sentiment_trend,
+            'sentiment_detail': sentiment_detail,
+            'sentiment_fill': min(abs(avg_sentiment) * 100, 100),
+            'session_status': session_status,
+            'messages_trend': messages_trend,
+            'messages_detail': messages_detail,
+            'completion_icon': completion_icon,
+            'completion_trend': completion_trend,
+            'completion_detail': completion_detail,
+            'completion_width': completion_rate * 100,
+            'completion_updating': " updating" if updating else "",
+            'ring_circumference': _RING_CIRCUMFERENCE,
+            'ring_offset': _RING_CIRCUMFERENCE * (1 - completion_rate),
+            'progress_markers': self._marker_strips[min(int(completion_rate * 8) + 1, 9)],
+            'sentiment_tip_icon': sentiment_tip_icon,
+            'sentiment_tip': sentiment_tip,
+            'completion_tip_icon': completion_tip_icon,
+            'completion_tip': completion_tip,
+            'bonus_tip': _METRICS_BONUS_TIP if message_count > 6 and avg_sentiment > 0.1 else ""
+        })
+        return self.get_metrics_style() + metrics_html
 
     def _create_detailed_metrics(self, metrics: Dict):
         """Create detailed metrics breakdown."""
@@ -1182,58 +1509,43 @@ class EnhancedUI:
             st.metric("Average Sentiment", f"{avg_sentiment:.3f}", delta=f"{avg_sentiment:+.3f}")
 
             # Sentiment breakdown
-            if avg_sentiment > 0.2:
-                st.success("😄 Very Positive - Great engagement!")
-            elif avg_sentiment > 0:
-                st.info("😊 Positive - Good conversation flow")
-            elif avg_sentiment > -0.2:
-                st.warning("😐 Neutral - Consider more encouragement")
-            else:
-                st.error("😟 Negative - Candidate may need support")
-
-        # Progress breakdown
-        st.markdown("**🎯 Progress Breakdown**")
-        progress_col1, progress_col2, progress_col3 = st.columns(3)
-
-        with progress_col1:
-            st.metric("Completion", f"{completion_rate:.1%}", delta=None)
-
-        with progress_col2:
-            remaining = 1 - completion_rate
-            st.metric("Remaining", f"{remaining:.1%}", delta=None)
+            st.markdown(
+                self._SENTIMENT_ALERTS[bisect_left(self._SENTIMENT_ALERT_BOUNDS, avg_sentiment)],
+                unsafe_allow_html=True
+            )
 
-        with progress_col3:
-            if completion_rate > 0:
-                eta = "2-3 min" if completion_rate > 0.7 else "5-7 min" if completion_rate > 0.3 else "8-10 min"
-                st.metric("Est. Time Left", eta, delta=None)
+        # Progress breakdown; read-only, so one grid instead of st.columns + st.metric
+        remaining = 1 - completion_rate
+        eta_cell = ""
+        if completion_rate > 0:
+            eta = "2-3 min" if completion_rate > 0.7 else "5-7 min" if completion_rate > 0.3 else "8-10 min"
+            eta_cell = f'<div class="stat-label">Est. Time Left</div><div class="stat-value">{eta}</div>'
+        st.markdown(
+            f"""<h4>🎯 Progress Breakdown</h4>
+            <div class="stat-grid">
+                <div><div class="stat-label">Completion</div><div class="stat-value">{completion_rate:.1%}</div></div>
+                <div><div class="stat-label">Remaining</div><div class="stat-value">{remaining:.1%}</div></div>
+                <div>{eta_cell}</div>
+            </div>""",
+            unsafe_allow_html=True
+        )
 
         # Interactive recommendations
-        st.markdown("**💡 AI Recommendations**")
-
-        recommendations = []
-        if avg_sentiment < -0.1:
-            recommendations.append("🤗 Provide more encouragement and support")
-        if message_count < 3:
-            recommendations.append("💬 Encourage more detailed responses")
-        if completion_rate < 0.3:
-            recommendations.append("🚀 Guide candidate through next steps")
-        if completion_rate > 0.8:
-            recommendations.append("🎉 Almost done! Prepare for final questions")
-
-        if not recommendations:
-            recommendations.append("✅ Conversation is flowing well!")
-
-        for rec in recommendations:
-            st.write(f"• {rec}")
-
-        # Quick actions
-        st.markdown("**⚡ Quick Actions**")
+        recommendations = _recommendations(avg_sentiment, message_count, completion_rate)
+
+        # Recommendations and the quick actions label go out as one element
+        rec_lines = "".join(f"<li>{rec}</li>" for rec in recommendations)
+        st.markdown(
+            f"<h4>💡 AI Recommendations</h4><ul>{rec_lines}</ul><h4>⚡ Quick Actions</h4>",
+            unsafe_allow_html=True
+        )
         action_col1, action_col2, action_col3 = st.columns(3)
 
         with action_col1:
             if st.button("🔄 Reset Metrics", help="Reset conversation metrics"):
                 st.session_state.conversation_metrics = {
                     'message_count': 0,
+                    'sum_polarity': 0.0,
                     'avg_sentiment': 0.0,
                     'completion_rate': 0.0
                 }
@@ -1242,15 +1554,20 @@ class EnhancedUI:
 
         with action_col2:
             if st.button("📊 Export Stats", help="Export conversation statistics"):
+                now = datetime.now()
                 stats_data = {
-                    'timestamp': str(datetime.now()),
+                    'timestamp': str(now),
                     'metrics': metrics,
                     'recommendations': recommendations
                 }
+                if orjson is not None:
+                    stats_json = orjson.dumps(stats_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                else:
+                    stats_json = json.dumps(stats_data, indent=2, default=str)
                 st.download_button(
                     label="📥 Download JSON",
-                    data=str(stats_data),
-                    file_name=f"conversation_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    data=stats_json,
+                    file_name=f"conversation_stats_{now.strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
 
@@ -1263,10 +1580,19 @@ class EnhancedUI:
         if not sentiment_history:
             return
 
-        import plotly.graph_objects as go
+        # Last 10 messages; unchanged histories reuse the cached figure. A
+        # SentimentHistory exposes its polarity column directly
+        polarities = getattr(sentiment_history, 'polarities', None)
+        if polarities is not None:
+            scores = tuple(polarities[-10:].tolist())
+        else:
+            scores = tuple(s.polarity for s in sentiment_history[-10:])
+        st.plotly_chart(_sentiment_figure_dict(scores), use_container_width=True)
+
+    def build_sentiment_figure(self, scores: Tuple[float, ...]):
+        """Build the live sentiment figure for a sequence of polarity scores."""
+        go = _lazy_plotly()
 
-        # Extract sentiment scores
-        scores = [s.polarity for s in sentiment_history[-10:]]  # Last 10 messages
         messages = list(range(1, len(scores) + 1))
 
         fig = go.Figure()
@@ -1298,18 +1624,11 @@ class EnhancedUI:
             paper_bgcolor='rgba(0,0,0,0)',
         )
 
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
     
     def create_metric_card(self, title: str, value: str, icon: str):
         """Create a metric display card."""
-        card_html = f"""
-        <div class="info-card" style="text-align: center;">
-            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
-            <div style="font-size: 1.5rem; font-weight: 600; color: {self.primary_color};">{value}</div>
-            <div style="font-size: 0.9rem; color: #666;">{title}</div>
-        </div>
-        """
-        st.markdown(card_html, unsafe_allow_html=True)
+        self._emit(_metric_card_html(title, value, icon, self.primary_color))
     
     def show_loading_spinner(self, message: str = "Processing..."):
         """Show loading spinner with message."""
@@ -1389,6 +1708,10 @@ class EnhancedUI:
                 • **Export not working?** Complete all steps first
                 """)
 
+            # Calm the page down for users who opted into the assistive modes
+            if screen_reader or simple_language:
+                st.markdown(f"<style>{_NO_MOTION_RULES}</style>", unsafe_allow_html=True)
+
             return {
                 'font_size': font_size,
                 'high_contrast': high_contrast,
@@ -1398,165 +1721,19 @@ class EnhancedUI:
 
     def create_simple_welcome_message(self):
         """Create a simple, clean welcome message."""
-        welcome_html = f"""
+        welcome_html = """
         <div class="simple-welcome fade-in-up">
             <div class="welcome-content">
                 <h3>👋 Welcome to TalentScout!</h3>
                 <p>I'm your AI hiring assistant. Let's get started with your application.</p>
             </div>
         </div>
-
-        <style>
-        .simple-welcome {{
-            background: white;
-            border-radius: 15px;
-            padding: 1.5rem;
-            margin: 1rem 0;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            border-left: 4px solid {self.primary_color};
-        }}
-
-        .welcome-content {{
-            text-align: center;
-        }}
-
-        .welcome-content h3 {{
-            color: {self.primary_color};
-            margin: 0 0 0.5rem 0;
-            font-size: 1.3rem;
-        }}
-
-        .welcome-content p {{
-            color: #6c757d;
-            margin: 0;
-            font-size: 1rem;
-        }}
-        </style>
         """
-        st.markdown(welcome_html, unsafe_allow_html=True)
+        self._emit(welcome_html)
 
     def create_floating_help_button(self):
         """Create a floating help button."""
-        help_html = f"""
-        <div class="floating-help-container">
-            <div class="floating-help-button" onclick="toggleHelp()">
-                <span class="help-icon">❓</span>
-                <span class="help-text">Help</span>
-            </div>
-
-            <div class="floating-help-menu" id="helpMenu">
-                <div class="help-item">
-                    <span class="help-item-icon">🚀</span>
-                    <span class="help-item-text">Getting Started</span>
-                </div>
-                <div class="help-item">
-                    <span class="help-item-icon">💬</span>
-                    <span class="help-item-text">Chat Tips</span>
-                </div>
-                <div class="help-item">
-                    <span class="help-item-icon">🌍</span>
-                    <span class="help-item-text">Languages</span>
-                </div>
-                <div class="help-item">
-                    <span class="help-item-icon">🔧</span>
-                    <span class="help-item-text">Settings</span>
-                </div>
-            </div>
-        </div>
-
-        <style>
-        .floating-help-container {{
-            position: fixed;
-            bottom: 2rem;
-            right: 2rem;
-            z-index: 1000;
-        }}
-
-        .floating-help-button {{
-            background: linear-gradient(135deg, {self.primary_color}, #45a049);
-            color: white;
-            border-radius: 50px;
-            padding: 1rem 1.5rem;
-            box-shadow: 0 8px 25px rgba(76, 175, 80, 0.3);
-            cursor: pointer;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            transition: all 0.3s ease;
-            font-weight: 600;
-        }}
-
-        .floating-help-button:hover {{
-            transform: translateY(-3px);
-            box-shadow: 0 12px 35px rgba(76, 175, 80, 0.4);
-        }}
-
-        .help-icon {{
-            font-size: 1.2rem;
-        }}
-
-        .floating-help-menu {{
-            position: absolute;
-            bottom: 100%;
-            right: 0;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            padding: 1rem;
-            margin-bottom: 1rem;
-            min-width: 200px;
-            opacity: 0;
-            visibility: hidden;
-            transform: translateY(10px);
-            transition: all 0.3s ease;
-        }}
-
-        .floating-help-menu.show {{
-            opacity: 1;
-            visibility: visible;
-            transform: translateY(0);
-        }}
-
-        .help-item {{
-            display: flex;
-            align-items: center;
-            gap: 0.75rem;
-            padding: 0.75rem;
-            border-radius: 10px;
-            cursor: pointer;
-            transition: background 0.2s ease;
-        }}
-
-        .help-item:hover {{
-            background: #f8f9fa;
-        }}
-
-        .help-item-icon {{
-            font-size: 1.1rem;
-        }}
-
-        .help-item-text {{
-            font-weight: 500;
-            color: #333;
-        }}
-        </style>
-
-        <script>
-        function toggleHelp() {{
-            const menu = document.getElementById('helpMenu');
-            menu.classList.toggle('show');
-        }}
-
-        // Close menu when clicking outside
-        document.addEventListener('click', function(event) {{
-            const container = document.querySelector('.floating-help-container');
-            if (!container.contains(event.target)) {{
-                document.getElementById('helpMenu').classList.remove('show');
-            }}
-        }});
-        </script>
-        """
-        st.markdown(help_html, unsafe_allow_html=True)
+        self._emit(_FLOATING_HELP_HTML)
 
     def create_quick_actions_panel(self):
         """Create a quick actions panel."""
@@ -1582,5 +1759,10 @@ class EnhancedUI:
 
         return None
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _sentiment_figure_dict(scores: Tuple[float, ...]) -> dict:
+    """Sentiment figure for the given scores as a plain dict, cached across reruns."""
+    return enhanced_ui.build_sentiment_figure(scores).to_dict()
+
 # Global instance
 enhanced_ui = EnhancedUI()
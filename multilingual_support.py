@@ -3,10 +3,97 @@ Multilingual Support Module for TalentScout
 Provides language detection, translation, and localized responses
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 import streamlit as st
 from dataclasses import dataclass
 
+try:
+    from langdetect import detect as langdetect_detect
+    from langdetect.lang_detect_exception import LangDetectException
+except ImportError:  # langdetect is optional; the keyword fallback is used instead
+    langdetect_detect = None
+    LangDetectException = Exception
+
+# Detection only looks at the first 256 characters
+DETECT_PREFIX_LENGTH = 256
+# Short ASCII replies (names, numbers, "yes") skip langdetect's n-gram scoring
+SHORT_ASCII_LENGTH = 32
+
+@lru_cache(maxsize=512)
+def _cached_detect(text: str) -> str:
+    """langdetect result for a text; short chat replies repeat a lot."""
+    return langdetect_detect(text)
+
+# Keyword fallback for when langdetect is unavailable; the group name is the language
+_LANG_KEYWORDS_RE = re.compile(
+    r'\b(?:'
+    r'(?P<es>hola|gracias|por favor|sí|no|español)'
+    r'|(?P<fr>bonjour|merci|oui|non|français|je suis)'
+    r'|(?P<de>hallo|danke|ja|nein|deutsch|ich bin)'
+    r')\b',
+    re.I
+)
+
+# Short ASCII replies are English unless they consist only of unambiguous greeting/courtesy
+# phrases of one language; 'no', 'non' and 'ja' are left out since English replies use them
+_SHORT_KEYWORDS = {
+    'es': ('hola', 'gracias', 'por favor'),
+    'fr': ('bonjour', 'merci', 'je suis'),
+    'de': ('hallo', 'danke', 'ich bin'),
+}
+_SHORT_KEYWORD_RES = tuple(
+    (lang, re.compile(rf'\W*(?:{alts})(?:\W+(?:{alts}))*\W*', re.I))
+    for lang, alts in ((lang, '|'.join(words)) for lang, words in _SHORT_KEYWORDS.items())
+)
+
+def _detect_short_ascii(text: str) -> str:
+    """'en' unless the whole text is made of one language's keyword phrases."""
+    for lang, pattern in _SHORT_KEYWORD_RES:
+        if pattern.fullmatch(text):
+            return lang
+    return 'en'
+
+# English names used when asking the model to answer in a given language
+_LANGUAGE_NAMES = {
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'zh': 'Chinese',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'ru': 'Russian'
+}
+
+_TECH_PROMPT_TEMPLATE = """Based on the candidate's tech stack: {tech_stack}
+Generate 3-5 relevant technical questions in {language} that:
+1. Assess fundamental understanding
+2. Test practical application knowledge  
+3. Evaluate problem-solving abilities
+Format the response as a numbered list of questions in {language}."""
+
+# translate_text's phrase table: "Welcome"/"welcome" per target language
+_WELCOME_RE = re.compile(r'[Ww]elcome')
+_WELCOME_MAP = {'es': 'Bienvenido', 'fr': 'Bienvenue', 'de': 'Willkommen'}
+
+_RTL_CSS = """
+<style>
+.stApp {
+    direction: rtl;
+    text-align: right;
+}
+.stTextInput > div > div > input {
+    text-align: right;
+}
+</style>
+"""
+
 @dataclass
 class LanguageConfig:
     """Configuration for supported languages."""
@@ -34,6 +121,17 @@ class MultilingualManager:
             'ru': LanguageConfig('ru', 'Русский', '🇷🇺')
         }
         
+        # Selector labels never change, so build them once
+        self._selector_options = {
+            f"{config.flag} {config.name}": config.code
+            for config in self.supported_languages.values()
+        }
+        self._selector_keys = list(self._selector_options)
+        self._rtl_css_by_lang = {
+            code: _RTL_CSS if config.rtl else ""
+            for code, config in self.supported_languages.items()
+        }
+        
         self.translations = {
             'en': {
                 'welcome_message': "Welcome to TalentScout! 👋 I'm your AI Hiring Assistant, and I'll be helping you with the initial screening process.",
@@ -100,35 +198,33 @@ class MultilingualManager:
                 'goodbye': "Vielen Dank für Ihre Zeit! Wir schätzen es, dass Sie sich die Zeit genommen haben, mit uns zu sprechen. Haben Sie einen großartigen Tag! 👋"
             }
         }
+        
+        # Flat (language, key) index so lookups are a single probe
+        self._flat_translations = {
+            (lang, key): text
+            for lang, strings in self.translations.items()
+            for key, text in strings.items()
+        }
     
     def detect_language(self, text: str) -> str:
         """Detect language of input text."""
+        if len(text) <= SHORT_ASCII_LENGTH and text.isascii():
+            return _detect_short_ascii(text)
+        if langdetect_detect is None:
+            return self._detect_language_simple(text)
         try:
-            from langdetect import detect
-            detected = detect(text)
-            return detected if detected in self.supported_languages else 'en'
-        except:
-            # Fallback: simple keyword detection
+            detected = _cached_detect(text[:DETECT_PREFIX_LENGTH])
+        except LangDetectException:
+            # No usable features (e.g. digits only); fall back to keywords
             return self._detect_language_simple(text)
+        return detected if detected in self.supported_languages else 'en'
     
     def _detect_language_simple(self, text: str) -> str:
         """Simple language detection based on common words."""
-        text_lower = text.lower()
-        
-        # Spanish indicators
-        if any(word in text_lower for word in ['hola', 'gracias', 'por favor', 'sí', 'no', 'español']):
-            return 'es'
-        
-        # French indicators
-        if any(word in text_lower for word in ['bonjour', 'merci', 'oui', 'non', 'français', 'je suis']):
-            return 'fr'
-        
-        # German indicators
-        if any(word in text_lower for word in ['hallo', 'danke', 'ja', 'nein', 'deutsch', 'ich bin']):
-            return 'de'
+        match = _LANG_KEYWORDS_RE.search(text)
         
         # Default to English
-        return 'en'
+        return match.lastgroup if match else 'en'
     
     def translate_text(self, text: str, target_language: str) -> str:
         """Translate text to target language using fallback method."""
@@ -136,55 +232,32 @@ class MultilingualManager:
         # In production, you could integrate with Azure Translator, AWS Translate, etc.
 
         # Simple keyword-based translation for common phrases
-        if target_language == 'es' and 'welcome' in text.lower():
-            return text.replace('Welcome', 'Bienvenido').replace('welcome', 'bienvenido')
-        elif target_language == 'fr' and 'welcome' in text.lower():
-            return text.replace('Welcome', 'Bienvenue').replace('welcome', 'bienvenue')
-        elif target_language == 'de' and 'welcome' in text.lower():
-            return text.replace('Welcome', 'Willkommen').replace('welcome', 'willkommen')
+        word = _WELCOME_MAP.get(target_language)
+        if word is not None:
+            lower = word.lower()
+            return _WELCOME_RE.sub(lambda m: word if m.group(0)[0] == 'W' else lower, text)
 
         # Fallback: return original text
         return text
     
     def get_translation(self, key: str, language: str = 'en') -> str:
         """Get translated text for a given key."""
-        if language in self.translations and key in self.translations[language]:
-            return self.translations[language][key]
-        elif key in self.translations['en']:
-            return self.translations['en'][key]
-        else:
-            return key
+        flat = self._flat_translations
+        return flat.get((language, key)) or flat.get(('en', key)) or key
     
     def get_language_selector(self) -> str:
         """Create language selector for Streamlit."""
-        language_options = {
-            f"{config.flag} {config.name}": config.code 
-            for config in self.supported_languages.values()
-        }
-        
         selected_display = st.selectbox(
             "🌍 Select Language / Seleccionar Idioma / Choisir la Langue",
-            options=list(language_options.keys()),
+            options=self._selector_keys,
             index=0
         )
         
-        return language_options[selected_display]
+        return self._selector_options[selected_display]
     
     def get_rtl_css(self, language: str) -> str:
         """Get CSS for right-to-left languages."""
-        if language in self.supported_languages and self.supported_languages[language].rtl:
-            return """
-            <style>
-            .stApp {
-                direction: rtl;
-                text-align: right;
-            }
-            .stTextInput > div > div > input {
-                text-align: right;
-            }
-            </style>
-            """
-        return ""
+        return self._rtl_css_by_lang.get(language, "")
     
     def format_message_with_language(self, message: str, language: str) -> str:
         """Format message with language-specific styling."""
@@ -195,32 +268,10 @@ class MultilingualManager:
     
     def get_language_specific_prompts(self, language: str) -> Dict[str, str]:
         """Get language-specific prompts for technical questions."""
-        base_prompt = """Based on the candidate's tech stack: {tech_stack}
-Generate 3-5 relevant technical questions in {language} that:
-1. Assess fundamental understanding
-2. Test practical application knowledge  
-3. Evaluate problem-solving abilities
-Format the response as a numbered list of questions in {language}."""
-        
-        language_names = {
-            'en': 'English',
-            'es': 'Spanish', 
-            'fr': 'French',
-            'de': 'German',
-            'it': 'Italian',
-            'pt': 'Portuguese',
-            'zh': 'Chinese',
-            'ja': 'Japanese',
-            'ko': 'Korean',
-            'ar': 'Arabic',
-            'hi': 'Hindi',
-            'ru': 'Russian'
-        }
-        
-        language_name = language_names.get(language, 'English')
+        language_name = _LANGUAGE_NAMES.get(language, 'English')
         
         return {
-            'tech_assessment_prompt': base_prompt.format(
+            'tech_assessment_prompt': _TECH_PROMPT_TEMPLATE.format(
                 tech_stack='{tech_stack}',
                 language=language_name
             )
@@ -4,14 +4,18 @@ Handles caching, async operations, and performance monitoring
 """
 
 import asyncio
+import heapq
+import itertools
+import os
+import sys
 import time
 import functools
+from collections import defaultdict
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 import streamlit as st
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import queue
+from concurrent.futures import ThreadPoolExecutor, wait
 
 class PerformanceOptimizer:
     """Handles performance optimization for the TalentScout application."""
@@ -19,9 +23,14 @@ class PerformanceOptimizer:
     def __init__(self):
         self.cache = {}
         self.cache_ttl = {}
-        self.performance_metrics = {}
-        self.request_queue = queue.Queue()
-        self.thread_pool = ThreadPoolExecutor(max_workers=4)
+        self._cache_sizes = {}
+        self._cache_bytes = 0  # running sum of sys.getsizeof over cached values
+        # Min-heap of (expiry, seq, key); entries go stale when a key is re-stored
+        self._expiry_heap = []
+        self._expiry_seq = itertools.count()
+        # Per-operation [count, total_ns, min_ns, max_ns, last_ns]
+        self.performance_metrics: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 2**63, 0, 0])
+        self.thread_pool: Optional[ThreadPoolExecutor] = None  # created on first use
         self.response_cache_duration = 300  # 5 minutes
         
     def timed_cache(self, ttl_seconds: int = 300):
@@ -29,75 +38,112 @@ class PerformanceOptimizer:
         def decorator(func: Callable) -> Callable:
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                # Create cache key
-                cache_key = f"{func.__name__}_{hash(str(args) + str(sorted(kwargs.items())))}"
+                # Create cache key; tuples hash natively, repr only for unhashable args
+                cache_key = (func.__qualname__, args, tuple(sorted(kwargs.items())) if kwargs else ())
+                try:
+                    hash(cache_key)
+                except TypeError:
+                    cache_key = (func.__qualname__, repr(args), repr(sorted(kwargs.items())))
                 
                 # Check if cached result exists and is still valid
-                if cache_key in self.cache:
-                    if datetime.now() < self.cache_ttl[cache_key]:
+                expiry = self.cache_ttl.get(cache_key)
+                if expiry is not None:
+                    if expiry > time.monotonic():
                         return self.cache[cache_key]
                     else:
                         # Remove expired cache entry
-                        del self.cache[cache_key]
-                        del self.cache_ttl[cache_key]
+                        self._evict(cache_key)
                 
                 # Execute function and cache result
-                start_time = time.time()
+                t0 = time.perf_counter_ns()
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                elapsed_ns = time.perf_counter_ns() - t0
                 
                 # Store in cache with TTL
-                self.cache[cache_key] = result
-                self.cache_ttl[cache_key] = datetime.now() + timedelta(seconds=ttl_seconds)
+                self._store(cache_key, result, ttl_seconds)
                 
                 # Record performance metrics
-                self.record_performance_metric(func.__name__, execution_time)
+                self.record_performance_metric(func.__name__, elapsed_ns)
                 
                 return result
             return wrapper
         return decorator
     
+    def _store(self, key, value, ttl_seconds: float):
+        """Cache a value and keep the byte total in step."""
+        size = sys.getsizeof(value)
+        self._cache_bytes += size - self._cache_sizes.get(key, 0)
+        self._cache_sizes[key] = size
+        expiry = time.monotonic() + ttl_seconds
+        self.cache[key] = value
+        self.cache_ttl[key] = expiry
+        heapq.heappush(self._expiry_heap, (expiry, next(self._expiry_seq), key))
+    
+    def _evict(self, key):
+        """Drop a cached value and its size accounting."""
+        self._cache_bytes -= self._cache_sizes.pop(key, 0)
+        self.cache.pop(key, None)
+        self.cache_ttl.pop(key, None)
+    
+    def clear_cache(self):
+        """Remove every cached entry."""
+        self.cache.clear()
+        self.cache_ttl.clear()
+        self._cache_sizes.clear()
+        self._cache_bytes = 0
+        self._expiry_heap.clear()
+    
     def async_wrapper(self, func: Callable) -> Callable:
         """Wrapper to run synchronous functions asynchronously."""
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            return self.thread_pool.submit(func, *args, **kwargs)
+            return self._pool().submit(func, *args, **kwargs)
         return wrapper
     
-    def record_performance_metric(self, operation: str, execution_time: float):
-        """Record performance metrics for monitoring."""
-        if operation not in self.performance_metrics:
-            self.performance_metrics[operation] = {
-                'total_calls': 0,
-                'total_time': 0.0,
-                'avg_time': 0.0,
-                'min_time': float('inf'),
-                'max_time': 0.0,
-                'last_call': None
-            }
-        
-        metrics = self.performance_metrics[operation]
-        metrics['total_calls'] += 1
-        metrics['total_time'] += execution_time
-        metrics['avg_time'] = metrics['total_time'] / metrics['total_calls']
-        metrics['min_time'] = min(metrics['min_time'], execution_time)
-        metrics['max_time'] = max(metrics['max_time'], execution_time)
-        metrics['last_call'] = datetime.now()
+    def _pool(self) -> ThreadPoolExecutor:
+        """Thread pool for async_wrapper, sized like the stdlib default."""
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4))
+        return self.thread_pool
+    
+    def record_performance_metric(self, operation: str, elapsed_ns: int):
+        """Record performance metrics for monitoring (elapsed time in ns)."""
+        m = self.performance_metrics[operation]
+        m[0] += 1
+        m[1] += elapsed_ns
+        if elapsed_ns < m[2]:
+            m[2] = elapsed_ns
+        if elapsed_ns > m[3]:
+            m[3] = elapsed_ns
+        m[4] = elapsed_ns
     
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate performance report."""
+        operations = {}
+        for name, (count, total_ns, min_ns, max_ns, last_ns) in list(self.performance_metrics.items()):
+            if not count:
+                continue
+            operations[name] = {
+                'total_calls': count,
+                'total_time': total_ns / 1e9,
+                'avg_time': total_ns / count / 1e9,
+                'min_time': min_ns / 1e9,
+                'max_time': max_ns / 1e9,
+                'last_time': last_ns / 1e9
+            }
+        
         return {
             'cache_size': len(self.cache),
             'cache_hit_ratio': self.calculate_cache_hit_ratio(),
-            'operations': self.performance_metrics.copy(),
+            'operations': operations,
             'memory_usage': self.estimate_memory_usage()
         }
     
     def calculate_cache_hit_ratio(self) -> float:
         """Calculate cache hit ratio."""
         total_operations = sum(
-            metrics['total_calls'] 
-            for metrics in self.performance_metrics.values()
+            metrics[0]
+            for metrics in list(self.performance_metrics.values())
         )
         
         if total_operations == 0:
@@ -109,9 +155,7 @@ class PerformanceOptimizer:
     
     def estimate_memory_usage(self) -> Dict[str, int]:
         """Estimate memory usage of cached data."""
-        import sys
-        
-        cache_size = sum(sys.getsizeof(value) for value in self.cache.values())
+        cache_size = self._cache_bytes
         metrics_size = sys.getsizeof(self.performance_metrics)
         
         return {
@@ -122,17 +166,18 @@ class PerformanceOptimizer:
     
     def cleanup_expired_cache(self):
         """Clean up expired cache entries."""
-        current_time = datetime.now()
-        expired_keys = [
-            key for key, expiry_time in self.cache_ttl.items()
-            if current_time >= expiry_time
-        ]
+        current_time = time.monotonic()
+        heap = self._expiry_heap
+        removed = 0
         
-        for key in expired_keys:
-            del self.cache[key]
-            del self.cache_ttl[key]
+        while heap and heap[0][0] <= current_time:
+            expiry, _, key = heapq.heappop(heap)
+            # Skip entries for keys that were since re-stored or evicted
+            if self.cache_ttl.get(key) == expiry:
+                self._evict(key)
+                removed += 1
         
-        return len(expired_keys)
+        return removed
     
     def preload_common_responses(self):
         """Preload common responses to improve performance."""
@@ -144,34 +189,43 @@ class PerformanceOptimizer:
             ['C#', '.NET', 'SQL Server']
         ]
         
+        try:
+            from utils import get_fallback_questions
+        except ImportError:
+            return
+        
         # Preload fallback questions for common tech stacks
         for tech_stack in common_tech_stacks:
-            try:
-                from utils import get_fallback_questions
-                self.cache[f"fallback_questions_{hash(str(tech_stack))}"] = get_fallback_questions(tech_stack)
-                self.cache_ttl[f"fallback_questions_{hash(str(tech_stack))}"] = datetime.now() + timedelta(hours=24)
-            except ImportError:
-                pass
+            key = ("fallback_questions", frozenset(tech_stack))
+            self._store(key, get_fallback_questions(tech_stack), 24 * 3600)
     
-    def batch_process_requests(self, requests: List[Callable], max_concurrent: int = 3) -> List[Any]:
-        """Process multiple requests concurrently."""
-        results = []
+    def batch_process_requests(self, requests: List[Callable], max_concurrent: Optional[int] = None,
+                               timeout: float = 30) -> List[Any]:
+        """Process multiple requests concurrently, waiting at most timeout seconds for the batch.
         
-        # Split requests into batches
-        for i in range(0, len(requests), max_concurrent):
-            batch = requests[i:i + max_concurrent]
-            
-            # Submit batch to thread pool
-            futures = [self.thread_pool.submit(request) for request in batch]
-            
-            # Collect results
-            for future in futures:
-                try:
-                    result = future.result(timeout=30)  # 30 second timeout
-                    results.append(result)
-                except Exception as e:
-                    results.append(f"Error: {e}")
+        Requests still running at the deadline are reported as errors and left to
+        finish in the background; this call never blocks past the deadline and
+        works whether or not an event loop is already running.
+        """
+        if not requests:
+            return []
+        
+        # A dedicated pool per batch, so abandoned requests can't starve async_wrapper
+        pool = ThreadPoolExecutor(max_workers=max_concurrent or min(len(requests), 32))
+        try:
+            futures = [pool.submit(request) for request in requests]
+            wait(futures, timeout=timeout)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
         
+        results = []
+        for future in futures:
+            if not future.done() or future.cancelled():
+                results.append(f"Error: request timed out after {timeout}s")
+            elif future.exception() is not None:
+                results.append(f"Error: {future.exception()}")
+            else:
+                results.append(future.result())
         return results
     
     def optimize_streamlit_performance(self):
@@ -195,30 +249,28 @@ class PerformanceOptimizer:
         """Create performance monitoring dashboard."""
         st.sidebar.subheader("⚡ Performance Monitor")
         
-        report = self.get_performance_report()
-        
         # Cache statistics
-        st.sidebar.metric("Cache Size", report['cache_size'])
-        st.sidebar.metric("Cache Hit Ratio", f"{report['cache_hit_ratio']:.2%}")
+        st.sidebar.metric("Cache Size", len(self.cache))
+        st.sidebar.metric("Cache Hit Ratio", f"{self.calculate_cache_hit_ratio():.2%}")
         
         # Memory usage
-        memory = report['memory_usage']
+        memory = self.estimate_memory_usage()
         memory_mb = memory['total_bytes'] / (1024 * 1024)
         st.sidebar.metric("Memory Usage", f"{memory_mb:.2f} MB")
         
-        # Operation performance
-        if report['operations']:
+        # Operation performance, read straight from the raw counters
+        operations = [(name, m[0], m[1]) for name, m in list(self.performance_metrics.items()) if m[0]]
+        if operations:
             with st.sidebar.expander("Operation Performance"):
-                for op_name, metrics in report['operations'].items():
+                for op_name, total_calls, total_ns in operations:
                     st.write(f"**{op_name}**")
-                    st.write(f"Avg Time: {metrics['avg_time']:.3f}s")
-                    st.write(f"Total Calls: {metrics['total_calls']}")
+                    st.write(f"Avg Time: {total_ns / total_calls / 1e9:.3f}s")
+                    st.write(f"Total Calls: {total_calls}")
                     st.write("---")
         
         # Performance controls
         if st.sidebar.button("Clear Cache"):
-            self.cache.clear()
-            self.cache_ttl.clear()
+            self.clear_cache()
             st.sidebar.success("Cache cleared!")
         
         if st.sidebar.button("Preload Common Data"):
@@ -235,16 +287,11 @@ class AsyncOperationManager:
     async def generate_questions_async(self, tech_stack: List[str]) -> List[str]:
         """Generate technical questions asynchronously."""
         try:
-            from utils import generate_technical_questions
+            from utils import generate_technical_questions_cached
             
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            questions = await loop.run_in_executor(
-                None, 
-                generate_technical_questions, 
-                tech_stack
-            )
-            return questions
+            # The OpenAI client is synchronous; keep it off the event loop. Going
+            # through the cached entry point shares results with the chat flow
+            return await asyncio.to_thread(generate_technical_questions_cached, tech_stack)
         except Exception as e:
             # Fallback to synchronous operation
             from utils import get_fallback_questions
@@ -255,13 +302,7 @@ class AsyncOperationManager:
         try:
             from sentiment_analyzer import sentiment_analyzer
             
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                sentiment_analyzer.analyze_sentiment,
-                text
-            )
-            return result
+            return await asyncio.to_thread(sentiment_analyzer.analyze_sentiment, text)
         except Exception as e:
             return {'error': str(e), 'emotion': 'neutral', 'polarity': 0.0}
     
@@ -3,30 +3,38 @@ Personalization Module for TalentScout
 Manages user preferences, history, and personalized responses
 """
 
+import atexit
 import json
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field, fields, is_dataclass
 import hashlib
-import streamlit as st
+from bisect import bisect_right
+from collections import deque
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Persistence errors are logged rather than shown, so this module imports without streamlit
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True, frozen=True)
 class UserPreferences:
-    """User preferences data structure."""
+    """User preferences data structure (immutable, so instances can be cached and shared)."""
     language: str = 'en'
     communication_style: str = 'professional'  # casual, professional, formal
     question_difficulty: str = 'adaptive'  # easy, medium, hard, adaptive
     response_length: str = 'medium'  # short, medium, detailed
-    preferred_topics: List[str] = None
-    accessibility_needs: List[str] = None
+    preferred_topics: Tuple[str, ...] = field(default_factory=tuple)
+    accessibility_needs: Tuple[str, ...] = field(default_factory=tuple)
     timezone: str = 'UTC'
-    
-    def __post_init__(self):
-        if self.preferred_topics is None:
-            self.preferred_topics = []
-        if self.accessibility_needs is None:
-            self.accessibility_needs = []
 
 @dataclass
 class ConversationHistory:
@@ -40,6 +48,103 @@ class ConversationHistory:
     tech_stack: List[str]
     performance_metrics: Dict[str, Any]
 
+def _json_default(obj):
+    """Stdlib fallback for the types orjson serializes natively."""
+    if is_dataclass(obj):
+        # Shallow field map; the encoder recurses itself, so asdict's deep copy is wasted
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def _dump_json(obj) -> bytes:
+    """Serialize to indented JSON bytes; dataclasses and datetimes are handled directly."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=_json_default).encode()
+
+def _dump_json_line(obj) -> bytes:
+    """Serialize to a single compact JSON line for the append-only history log."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str) + b'\n'
+    return json.dumps(obj, default=_json_default).encode() + b'\n'
+
+def _load_json(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# History is an append-only JSONL log; only the last HISTORY_LIMIT entries are kept,
+# and the file is rewritten down to them once it grows past HISTORY_COMPACT_LINES
+HISTORY_LIMIT = 10
+HISTORY_COMPACT_LINES = 50
+
+# Adaptive difficulty by years of experience: <2 easy, <5 medium, otherwise hard
+_EXPERIENCE_BOUNDS = (2, 5)
+_EXPERIENCE_DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Saves are buffered and written by a background thread after this delay
+WRITE_DEBOUNCE_SECONDS = 0.2
+# Append handles kept open for the most recently written history logs
+MAX_OPEN_HISTORY_FILES = 64
+
+@lru_cache(maxsize=1024)
+def _user_id_for(email: str) -> str:
+    """Anonymous user ID for an email; the same address is hashed on every rerun."""
+    # First 8 bytes of SHA-256, same value as hexdigest()[:16] so existing IDs stay valid
+    return hashlib.sha256(email.encode()).digest()[:8].hex()
+
+@lru_cache(maxsize=1024)
+def _user_file(data_dir: str, user_id: str, suffix: str) -> str:
+    """Path of a per-user data file; the same few paths are rebuilt on every rerun."""
+    return os.path.join(data_dir, f"{user_id}{suffix}")
+
+def _file_version(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+# Loaders are keyed on the file version, so a save (which bumps mtime) invalidates them
+@lru_cache(maxsize=256)
+def _load_prefs_cached(path: str, version: Tuple[int, int]) -> UserPreferences:
+    with open(path, 'rb') as f:
+        data = _load_json(f.read())
+    for key in ('preferred_topics', 'accessibility_needs'):
+        data[key] = tuple(data.get(key) or ())
+    return UserPreferences(**data)
+
+@lru_cache(maxsize=256)
+def _load_history_cached(path: str, version: Tuple[int, int]) -> Tuple[ConversationHistory, ...]:
+    with open(path, 'rb') as f:
+        lines = f.read().splitlines()
+    
+    histories = []
+    for line in lines:
+        if not line.strip():
+            continue
+        item = _load_json(line)
+        item['timestamp'] = datetime.fromisoformat(item['timestamp'])
+        histories.append(ConversationHistory(**item))
+    
+    return tuple(histories)
+
+@lru_cache(maxsize=256)
+def _history_stats(path: str, version: Tuple[int, int]) -> Tuple[float, float, Tuple[str, ...]]:
+    """(avg completion, avg sentiment, distinct technologies) over the recent history."""
+    recent = _load_history_cached(path, version)[-HISTORY_LIMIT:]
+    completion_total = 0.0
+    sentiment_total = 0.0
+    technologies = set()
+    
+    for h in recent:
+        completion_total += h.completion_rate
+        technologies.update(h.tech_stack)
+        if h.sentiment_scores:
+            sentiment_total += sum(h.sentiment_scores) / len(h.sentiment_scores)
+    
+    return completion_total / len(recent), sentiment_total / len(recent), tuple(technologies)
+
 class PersonalizationManager:
     """Manages user personalization and history."""
     
@@ -49,6 +154,20 @@ class PersonalizationManager:
         self.history_file = "conversation_history.json"
         self.ensure_data_directory()
         
+        # Pending writes: latest preferences blob per path, appended history lines per path
+        self._pending_prefs: Dict[str, bytes] = {}
+        self._pending_history: Dict[str, List[bytes]] = {}
+        # Last HISTORY_LIMIT conversations per user once loaded, kept current by saves
+        self._recent_history: Dict[str, deque] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._history_files: Dict[str, BinaryIO] = {}
+        # Users whose pre-JSONL history file has already been checked for migration
+        self._legacy_checked: set = set()
+        atexit.register(self.close)
+        
         # Communication styles
         self.communication_styles = {
             'casual': {
@@ -90,134 +209,251 @@ class PersonalizationManager:
                 'complexity_level': 2
             }
         }
+        
+        # Prompt addition per difficulty, flattened for the per-question lookup
+        self._prompt_additions = {
+            name: modifier['prompt_addition']
+            for name, modifier in self.difficulty_modifiers.items()
+        }
+        
+        # Greeting and encouragement text per style, resolved once instead of per call
+        name_suffixes = {
+            'casual': "! Ready to dive in?",
+            'professional': "! Let's get started with your application.",
+            'formal': ". We are pleased to begin this assessment."
+        }
+        reassurances = {
+            'casual': "No worries at all! You're doing fine. 😊",
+            'professional': "That's perfectly fine. Take your time with your response.",
+            'formal': "Please proceed with confidence. Your responses are valued."
+        }
+        self._greetings = {
+            name: (style['greeting'], name_suffixes[name])
+            for name, style in self.communication_styles.items()
+        }
+        self._encouragements = {
+            name: (reassurances[name], "Thank you for your response.", style['encouragement'])
+            for name, style in self.communication_styles.items()
+        }
     
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist."""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
+    
+    def _prefs_path(self, user_id: str) -> str:
+        return _user_file(self.data_dir, user_id, "_preferences.json")
+    
+    def _history_path(self, user_id: str) -> str:
+        path = _user_file(self.data_dir, user_id, "_history.jsonl")
+        if user_id not in self._legacy_checked:
+            self._legacy_checked.add(user_id)
+            self._migrate_legacy_history(user_id, path)
+        return path
+    
+    def _migrate_legacy_history(self, user_id: str, history_path: str):
+        """Fold an old {user_id}_history.json array into the front of the JSONL log."""
+        legacy_path = _user_file(self.data_dir, user_id, "_history.json")
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'rb') as f:
+                items = _load_json(f.read())
+            legacy_lines = b''.join(_dump_json_line(item) for item in items[-HISTORY_LIMIT:])
+            
+            with self._flush_lock:
+                # Anything already appended to the new log is newer than the legacy entries
+                try:
+                    with open(history_path, 'rb') as f:
+                        existing = f.read()
+                except FileNotFoundError:
+                    existing = b''
+                tmp_path = history_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(legacy_lines + existing)
+                self._close_history_file(history_path)
+                os.replace(tmp_path, history_path)
+            os.remove(legacy_path)
+        except Exception as e:
+            logger.warning("Could not migrate conversation history from %s: %s", legacy_path, e)
     
     def generate_user_id(self, email: str) -> str:
         """Generate anonymous user ID from email."""
-        return hashlib.sha256(email.encode()).hexdigest()[:16]
+        return _user_id_for(email)
     
     def save_user_preferences(self, user_id: str, preferences: UserPreferences):
         """Save user preferences to file."""
         try:
-            prefs_path = os.path.join(self.data_dir, f"{user_id}_preferences.json")
-            with open(prefs_path, 'w') as f:
-                json.dump(asdict(preferences), f, indent=2)
+            prefs_path = self._prefs_path(user_id)
+            data = _dump_json(preferences)
+            with self._pending_lock:
+                self._pending_prefs[prefs_path] = data
+            self._schedule_flush()
         except Exception as e:
-            st.error(f"Error saving preferences: {e}")
+            logger.warning("Error saving preferences: %s", e)
     
     def load_user_preferences(self, user_id: str) -> UserPreferences:
         """Load user preferences from file."""
         try:
-            prefs_path = os.path.join(self.data_dir, f"{user_id}_preferences.json")
-            if os.path.exists(prefs_path):
-                with open(prefs_path, 'r') as f:
-                    data = json.load(f)
-                return UserPreferences(**data)
+            self._flush_if_pending()
+            prefs_path = self._prefs_path(user_id)
+            version = _file_version(prefs_path)
+            if version is not None:
+                return _load_prefs_cached(prefs_path, version)
         except Exception as e:
-            st.warning(f"Could not load preferences: {e}")
+            logger.warning("Could not load preferences: %s", e)
         
         return UserPreferences()  # Return default preferences
     
     def save_conversation_history(self, history: ConversationHistory):
         """Save conversation history."""
         try:
-            history_path = os.path.join(self.data_dir, f"{history.user_id}_history.json")
-            
-            # Load existing history
-            existing_history = []
-            if os.path.exists(history_path):
-                with open(history_path, 'r') as f:
-                    existing_history = json.load(f)
+            history_path = self._history_path(history.user_id)
             
-            # Add new conversation
-            history_dict = asdict(history)
-            history_dict['timestamp'] = history.timestamp.isoformat()
-            existing_history.append(history_dict)
-            
-            # Keep only last 10 conversations
-            existing_history = existing_history[-10:]
-            
-            with open(history_path, 'w') as f:
-                json.dump(existing_history, f, indent=2, default=str)
+            # Append the new conversation; trimming happens on load
+            line = _dump_json_line(history)
+            with self._pending_lock:
+                self._pending_history.setdefault(history_path, []).append(line)
+                recent = self._recent_history.get(history.user_id)
+                if recent is not None:
+                    recent.append(history)
+            self._schedule_flush()
                 
         except Exception as e:
-            st.error(f"Error saving conversation history: {e}")
+            logger.warning("Error saving conversation history: %s", e)
     
     def load_conversation_history(self, user_id: str) -> List[ConversationHistory]:
         """Load conversation history for user."""
+        recent = self._recent_history.get(user_id)
+        if recent is not None:
+            with self._pending_lock:
+                return list(recent)
+        
         try:
-            history_path = os.path.join(self.data_dir, f"{user_id}_history.json")
-            if os.path.exists(history_path):
-                with open(history_path, 'r') as f:
-                    data = json.load(f)
-                
-                histories = []
-                for item in data:
-                    item['timestamp'] = datetime.fromisoformat(item['timestamp'])
-                    histories.append(ConversationHistory(**item))
-                
-                return histories
+            self._flush_if_pending()
+            history_path = self._history_path(user_id)
+            version = _file_version(history_path)
+            histories = _load_history_cached(history_path, version) if version is not None else ()
+            recent = histories[-HISTORY_LIMIT:]
+            if len(histories) > HISTORY_COMPACT_LINES:
+                self._compact_history(history_path, recent)
+            with self._pending_lock:
+                self._recent_history.setdefault(user_id, deque(recent, maxlen=HISTORY_LIMIT))
+            return list(recent)
         except Exception as e:
-            st.warning(f"Could not load conversation history: {e}")
+            logger.warning("Could not load conversation history: %s", e)
         
         return []
     
+    def _compact_history(self, history_path: str, recent):
+        """Rewrite the history log down to its most recent entries."""
+        tmp_path = history_path + ".tmp"
+        with self._flush_lock:
+            with open(tmp_path, 'wb') as f:
+                for h in recent:
+                    f.write(_dump_json_line(h))
+            # A cached append handle would keep writing to the replaced file
+            self._close_history_file(history_path)
+            os.replace(tmp_path, history_path)
+    
+    def _schedule_flush(self):
+        """Wake the background writer, starting it on first use."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="personalization-writer", daemon=True)
+            self._writer.start()
+        self._flush_requested.set()
+    
+    def _writer_loop(self):
+        while True:
+            self._flush_requested.wait()
+            # Let saves from the same rerun pile up, then write them together
+            time.sleep(WRITE_DEBOUNCE_SECONDS)
+            self._flush_requested.clear()
+            self.flush_writes()
+    
+    def _flush_if_pending(self):
+        """Write buffered saves first so loads see them."""
+        if self._pending_prefs or self._pending_history:
+            self.flush_writes()
+    
+    def flush_writes(self):
+        """Write all buffered preference and history saves to disk."""
+        with self._flush_lock:
+            with self._pending_lock:
+                prefs, self._pending_prefs = self._pending_prefs, {}
+                history, self._pending_history = self._pending_history, {}
+            
+            for path, data in prefs.items():
+                try:
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                except OSError as e:
+                    logger.warning("Failed to save preferences to %s: %s", path, e)
+            
+            for path, lines in history.items():
+                try:
+                    f = self._history_file(path)
+                    f.write(b''.join(lines))
+                    f.flush()
+                except OSError as e:
+                    self._close_history_file(path)
+                    logger.warning("Failed to save conversation history to %s: %s", path, e)
+    
+    def _history_file(self, path: str) -> BinaryIO:
+        """Open append handle for a history log; caller holds _flush_lock."""
+        f = self._history_files.pop(path, None)
+        if f is None:
+            if len(self._history_files) >= MAX_OPEN_HISTORY_FILES:
+                # Evict the least recently written handle
+                self._history_files.pop(next(iter(self._history_files))).close()
+            f = open(path, 'ab')
+        self._history_files[path] = f  # re-insert to mark as most recent
+        return f
+    
+    def _close_history_file(self, path: str):
+        f = self._history_files.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+    
+    def close(self):
+        """Flush buffered saves and close cached history handles."""
+        self.flush_writes()
+        with self._flush_lock:
+            for path in list(self._history_files):
+                self._close_history_file(path)
+    
     def get_personalized_greeting(self, preferences: UserPreferences, user_name: str = "") -> str:
         """Generate personalized greeting based on preferences."""
-        style = self.communication_styles.get(preferences.communication_style, self.communication_styles['professional'])
-        base_greeting = style['greeting']
+        greeting, name_suffix = self._greetings.get(preferences.communication_style, self._greetings['professional'])
         
         if user_name:
-            if preferences.communication_style == 'casual':
-                return f"{base_greeting} {user_name}! Ready to dive in?"
-            elif preferences.communication_style == 'formal':
-                return f"{base_greeting} {user_name}. We are pleased to begin this assessment."
-            else:
-                return f"{base_greeting} {user_name}! Let's get started with your application."
+            return f"{greeting} {user_name}{name_suffix}"
         
-        return base_greeting
+        return greeting
     
     def get_personalized_encouragement(self, preferences: UserPreferences, sentiment_score: float = 0.0) -> str:
         """Generate personalized encouragement based on preferences and sentiment."""
-        style = self.communication_styles.get(preferences.communication_style, self.communication_styles['professional'])
-        base_encouragement = style['encouragement']
-        
-        # Adjust based on sentiment
-        if sentiment_score < -0.3:  # Negative sentiment
-            if preferences.communication_style == 'casual':
-                return "No worries at all! You're doing fine. 😊"
-            elif preferences.communication_style == 'formal':
-                return "Please proceed with confidence. Your responses are valued."
-            else:
-                return "That's perfectly fine. Take your time with your response."
-        elif sentiment_score > 0.3:  # Positive sentiment
-            return base_encouragement
-        else:
-            return "Thank you for your response."
+        # Adjust based on sentiment: -1 negative, 0 neutral, 1 positive
+        bucket = -1 if sentiment_score < -0.3 else 1 if sentiment_score > 0.3 else 0
+        encouragements = self._encouragements.get(preferences.communication_style, self._encouragements['professional'])
+        return encouragements[bucket + 1]
     
     def adapt_question_difficulty(self, preferences: UserPreferences, experience_years: float, previous_performance: float = 0.5) -> str:
         """Adapt question difficulty based on user profile."""
-        if preferences.question_difficulty == 'adaptive':
-            if experience_years < 2:
-                difficulty = 'easy'
-            elif experience_years < 5:
-                difficulty = 'medium'
-            else:
-                difficulty = 'hard'
-            
-            # Adjust based on previous performance
+        difficulty = preferences.question_difficulty
+        if difficulty == 'adaptive':
+            # Adjust based on previous performance, else on experience
             if previous_performance < 0.3:
                 difficulty = 'easy'
             elif previous_performance > 0.8:
                 difficulty = 'hard'
-        else:
-            difficulty = preferences.question_difficulty
+            else:
+                difficulty = _EXPERIENCE_DIFFICULTIES[bisect_right(_EXPERIENCE_BOUNDS, experience_years)]
         
-        return self.difficulty_modifiers.get(difficulty, self.difficulty_modifiers['medium'])['prompt_addition']
+        additions = self._prompt_additions
+        return additions.get(difficulty) or additions['medium']
     
     def get_response_length_modifier(self, preferences: UserPreferences) -> str:
         """Get response length modifier for prompts."""
@@ -235,17 +471,12 @@ class PersonalizationManager:
         if not history:
             return {'pattern': 'new_user', 'recommendations': []}
         
-        # Analyze patterns
-        avg_completion_rate = sum(h.completion_rate for h in history) / len(history)
-        common_tech_stacks = []
-        avg_sentiment = 0.0
-        
-        for h in history:
-            common_tech_stacks.extend(h.tech_stack)
-            if h.sentiment_scores:
-                avg_sentiment += sum(h.sentiment_scores) / len(h.sentiment_scores)
-        
-        avg_sentiment = avg_sentiment / len(history) if history else 0.0
+        # Analyze patterns; cached per history file version like the loader itself
+        self._flush_if_pending()
+        history_path = self._history_path(user_id)
+        avg_completion_rate, avg_sentiment, technologies = _history_stats(
+            history_path, _file_version(history_path)
+        )
         
         # Generate recommendations
         recommendations = []
@@ -253,20 +484,22 @@ class PersonalizationManager:
             recommendations.append("Consider shorter sessions or easier questions")
         if avg_sentiment < -0.2:
             recommendations.append("Provide more encouragement and support")
-        if len(set(common_tech_stacks)) > 10:
+        if len(technologies) > 10:
             recommendations.append("User has diverse technical background")
         
         return {
             'pattern': 'returning_user',
             'avg_completion_rate': avg_completion_rate,
             'avg_sentiment': avg_sentiment,
-            'common_technologies': list(set(common_tech_stacks)),
+            'common_technologies': list(technologies),
             'recommendations': recommendations,
             'total_sessions': len(history)
         }
     
     def create_preferences_ui(self) -> UserPreferences:
         """Create UI for setting user preferences."""
+        import streamlit as st
+        
         st.sidebar.subheader("🎯 Personalization Settings")
         
         # Communication style
@@ -304,7 +537,7 @@ class PersonalizationManager:
             communication_style=comm_style,
             question_difficulty=difficulty,
             response_length=response_length,
-            accessibility_needs=accessibility
+            accessibility_needs=tuple(accessibility)
         )
 
 # Global instance
@@ -3,8 +3,12 @@ Python 3.13 Compatibility Module
 Provides compatibility fixes for modules that were removed in Python 3.13
 """
 
+import html
+import re
 import sys
+import types
 import warnings
+from typing import List
 
 def setup_compatibility():
     """Set up compatibility for Python 3.13."""
@@ -18,24 +22,14 @@ def setup_compatibility():
             import cgi
         except ImportError:
             # Create a minimal cgi module replacement
-            class MockCGI:
-                def escape(self, s, quote=False):
-                    """Escape HTML characters."""
-                    s = s.replace("&", "&amp;")
-                    s = s.replace("<", "&lt;")
-                    s = s.replace(">", "&gt;")
-                    if quote:
-                        s = s.replace('"', "&quot;")
-                        s = s.replace("'", "&#x27;")
-                    return s
-                
-                def parse_qs(self, qs, keep_blank_values=False, strict_parsing=False):
-                    """Parse query string (basic implementation)."""
-                    from urllib.parse import parse_qs as urllib_parse_qs
-                    return urllib_parse_qs(qs, keep_blank_values, strict_parsing)
+            from urllib.parse import parse_qs
             
-            # Add mock cgi to sys.modules
-            sys.modules['cgi'] = MockCGI()
+            cgi = types.ModuleType('cgi')
+            cgi.escape = lambda s, quote=False: html.escape(s, quote=quote)
+            cgi.parse_qs = parse_qs
+            
+            # Add the replacement to sys.modules
+            sys.modules['cgi'] = cgi
             print("✅ Created cgi module compatibility layer")
         
         # Suppress specific warnings for Python 3.13
@@ -67,6 +61,36 @@ def check_dependencies():
     
     return True
 
+def read_requirements(path: str = "requirements.txt") -> List[str]:
+    """Requirement specifiers from a requirements file, without comments or blank lines."""
+    with open(path, encoding='utf-8') as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+def find_missing_packages(requirements: List[str]) -> List[str]:
+    """Return the requirements not satisfied by what is already installed."""
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        # Can't evaluate version specifiers; leave it all to pip
+        return list(requirements)
+    from importlib.metadata import version, PackageNotFoundError
+    
+    missing = []
+    for spec in requirements:
+        req = Requirement(spec)
+        if req.marker is not None and not req.marker.evaluate():
+            continue
+        try:
+            installed = version(req.name)
+        except PackageNotFoundError:
+            missing.append(spec)
+            continue
+        if not req.specifier.contains(installed, prereleases=True):
+            missing.append(spec)
+    
+    return missing
+
 def install_compatible_packages():
     """Install Python 3.13 compatible packages."""
     import subprocess
@@ -82,68 +106,86 @@ def install_compatible_packages():
         "numpy>=1.26.4"
     ]
     
+    missing_packages = find_missing_packages(compatible_packages)
+    if not missing_packages:
+        print("✅ Compatible packages already installed")
+        return
+    
     print("📦 Installing Python 3.13 compatible packages...")
     
-    for package in compatible_packages:
-        try:
-            subprocess.run([sys.executable, "-m", "pip", "install", package], 
-                         check=True, capture_output=True)
-            print(f"✅ Installed: {package}")
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️  Warning: Could not install {package}")
+    # One pip run resolves everything together; pip's own progress goes to the console
+    result = subprocess.run([sys.executable, "-m", "pip", "install", *missing_packages])
+    if result.returncode != 0:
+        # Retry one by one so a single bad package doesn't block the rest
+        for package in missing_packages:
+            if subprocess.run([sys.executable, "-m", "pip", "install", package]).returncode == 0:
+                print(f"✅ Installed: {package}")
+            else:
+                print(f"⚠️  Warning: Could not install {package}")
     
     print("✅ Package installation complete")
 
+# Basic translation dictionary for common phrases
+_FALLBACK_TRANSLATIONS = {
+    'es': {
+        'welcome': 'bienvenido',
+        'hello': 'hola',
+        'thank you': 'gracias',
+        'goodbye': 'adiós',
+        'name': 'nombre',
+        'email': 'correo electrónico',
+        'phone': 'teléfono',
+        'experience': 'experiencia',
+        'position': 'posición',
+        'location': 'ubicación'
+    },
+    'fr': {
+        'welcome': 'bienvenue',
+        'hello': 'bonjour',
+        'thank you': 'merci',
+        'goodbye': 'au revoir',
+        'name': 'nom',
+        'email': 'e-mail',
+        'phone': 'téléphone',
+        'experience': 'expérience',
+        'position': 'position',
+        'location': 'emplacement'
+    },
+    'de': {
+        'welcome': 'willkommen',
+        'hello': 'hallo',
+        'thank you': 'danke',
+        'goodbye': 'auf wiedersehen',
+        'name': 'name',
+        'email': 'e-mail',
+        'phone': 'telefon',
+        'experience': 'erfahrung',
+        'position': 'position',
+        'location': 'standort'
+    }
+}
+
+# Per language: lowercase and Title Case phrase -> translation, matched in one regex pass
+_FALLBACK_LOOKUP = {}
+_FALLBACK_PATTERNS = {}
+for _lang, _phrases in _FALLBACK_TRANSLATIONS.items():
+    _lookup = {}
+    for _english, _translated in _phrases.items():
+        _lookup[_english] = _translated
+        _lookup[_english.title()] = _translated.title()
+    _FALLBACK_LOOKUP[_lang] = _lookup
+    _FALLBACK_PATTERNS[_lang] = re.compile(
+        '|'.join(re.escape(phrase) for phrase in sorted(_lookup, key=len, reverse=True))
+    )
+
 def get_fallback_translation(text: str, target_lang: str) -> str:
     """Provide fallback translation without external dependencies."""
+    pattern = _FALLBACK_PATTERNS.get(target_lang)
+    if pattern is None:
+        return text
     
-    # Basic translation dictionary for common phrases
-    translations = {
-        'es': {
-            'welcome': 'bienvenido',
-            'hello': 'hola',
-            'thank you': 'gracias',
-            'goodbye': 'adiós',
-            'name': 'nombre',
-            'email': 'correo electrónico',
-            'phone': 'teléfono',
-            'experience': 'experiencia',
-            'position': 'posición',
-            'location': 'ubicación'
-        },
-        'fr': {
-            'welcome': 'bienvenue',
-            'hello': 'bonjour',
-            'thank you': 'merci',
-            'goodbye': 'au revoir',
-            'name': 'nom',
-            'email': 'e-mail',
-            'phone': 'téléphone',
-            'experience': 'expérience',
-            'position': 'position',
-            'location': 'emplacement'
-        },
-        'de': {
-            'welcome': 'willkommen',
-            'hello': 'hallo',
-            'thank you': 'danke',
-            'goodbye': 'auf wiedersehen',
-            'name': 'name',
-            'email': 'e-mail',
-            'phone': 'telefon',
-            'experience': 'erfahrung',
-            'position': 'position',
-            'location': 'standort'
-        }
-    }
-    
-    if target_lang in translations:
-        text_lower = text.lower()
-        for english, translated in translations[target_lang].items():
-            text = text.replace(english, translated)
-            text = text.replace(english.title(), translated.title())
-    
-    return text
+    lookup = _FALLBACK_LOOKUP[target_lang]
+    return pattern.sub(lambda m: lookup[m.group(0)], text)
 
 def safe_import(module_name: str, fallback=None):
     """Safely import a module with fallback."""
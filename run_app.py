@@ -45,10 +45,17 @@ def check_environment():
 
 def install_dependencies():
     """Install required dependencies."""
-    print("📦 Installing dependencies...")
+    from python313_compatibility import find_missing_packages, read_requirements
+    
+    # Skip pip entirely when everything is already installed at a matching version
+    missing = find_missing_packages(read_requirements("requirements.txt"))
+    if not missing:
+        print("✅ Dependencies satisfied")
+        return True
+    
+    print(f"📦 Installing dependencies: {', '.join(missing)}")
     try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], 
-                      check=True, capture_output=True)
+        subprocess.run([sys.executable, "-m", "pip", "install", *missing], check=True)
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -3,13 +3,22 @@ Advanced Sentiment Analysis Module for TalentScout
 Analyzes candidate emotions and provides insights during conversations
 """
 
+import math
 import re
+from bisect import bisect_right
+from collections import Counter
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+import numpy as np
 import streamlit as st
 
-@dataclass
+try:
+    from textblob import TextBlob
+except ImportError:
+    TextBlob = None
+
+@dataclass(slots=True, frozen=True)
 class SentimentResult:
     """Data class for sentiment analysis results."""
     polarity: float  # -1 (negative) to 1 (positive)
@@ -19,6 +28,60 @@ class SentimentResult:
     keywords: List[str]  # Key emotional indicators
     timestamp: datetime
 
+# Emotion labels in category order; SentimentHistory stores them by index
+EMOTIONS = ('excited', 'confident', 'nervous', 'frustrated', 'positive', 'negative', 'neutral')
+_EMOTION_CODES = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+_NEUTRAL_CODE = _EMOTION_CODES['neutral']
+_EMOTION_EMOJIS = ('🤩', '😊', '😰', '😤', '😄', '😞', '😐')
+
+# TextBlob polarity buckets: below -0.3, [-0.3, -0.1), [-0.1, 0.1], (0.1, 0.3], above 0.3
+_POLARITY_BOUNDS = (-0.3, -0.1, math.nextafter(0.1, math.inf), math.nextafter(0.3, math.inf))
+_POLARITY_EMOTIONS = ('negative', 'nervous', 'neutral', 'confident', 'positive')
+
+class SentimentHistory:
+    """Sentiment results for a conversation, with polarity and emotion also kept as columns."""
+    
+    def __init__(self, capacity: int = 32):
+        self._results: List[SentimentResult] = []
+        self._polarity = np.empty(capacity, dtype=np.float64)
+        self._emotion = np.empty(capacity, dtype=np.int8)
+    
+    def append(self, result: SentimentResult):
+        """Add a result, growing the columns geometrically when full."""
+        n = len(self._results)
+        if n == len(self._polarity):
+            self._polarity = np.concatenate((self._polarity, np.empty_like(self._polarity)))
+            self._emotion = np.concatenate((self._emotion, np.empty_like(self._emotion)))
+        self._polarity[n] = result.polarity
+        self._emotion[n] = _EMOTION_CODES.get(result.emotion, _NEUTRAL_CODE)
+        self._results.append(result)
+    
+    def __len__(self) -> int:
+        return len(self._results)
+    
+    def __getitem__(self, index):
+        return self._results[index]
+    
+    def __iter__(self):
+        return iter(self._results)
+    
+    def emoji(self, index: int) -> str:
+        """Emoji for the emotion of the result at index, read from the code column."""
+        return _EMOTION_EMOJIS[self._emotion[:len(self._results)][index]]
+    
+    @property
+    def polarities(self) -> np.ndarray:
+        """Polarity of every result so far, as a view."""
+        return self._polarity[:len(self._results)]
+    
+    def emotion_counts(self) -> Dict[str, int]:
+        """Count of each emotion, in order of first appearance."""
+        codes, first, counts = np.unique(
+            self._emotion[:len(self._results)], return_index=True, return_counts=True
+        )
+        order = np.argsort(first)
+        return {EMOTIONS[codes[i]]: int(counts[i]) for i in order}
+
 class AdvancedSentimentAnalyzer:
     """Advanced sentiment analyzer with multiple detection methods."""
     
@@ -38,35 +101,51 @@ class AdvancedSentimentAnalyzer:
             'somewhat': 0.8, 'slightly': 0.6, 'a bit': 0.7, 'not very': 0.4
         }
         
-    def analyze_text_basic(self, text: str) -> SentimentResult:
-        """Basic sentiment analysis using keyword matching."""
+        # One alternation over every keyword and modifier, longest first, so a
+        # single scan finds them all; _phrase_kinds maps each phrase to its role
+        self._phrase_kinds = {}
+        for emotion, keywords in self.emotion_keywords.items():
+            for keyword in keywords:
+                self._phrase_kinds[keyword] = ('emotion', emotion)
+        for modifier, multiplier in self.intensity_modifiers.items():
+            self._phrase_kinds[modifier] = ('modifier', multiplier)
+        self._phrase_re = re.compile(
+            '|'.join(re.escape(phrase) for phrase in sorted(self._phrase_kinds, key=len, reverse=True))
+        )
+        
+    def analyze_text_basic(self, text: str, text_lower: Optional[str] = None) -> SentimentResult:
+        """Basic sentiment analysis using keyword matching; pass text_lower if the caller already has it."""
         if not text or len(text.strip()) < 3:
             return SentimentResult(0.0, 0.0, 'neutral', 0.5, [], datetime.now())
         
-        text_lower = text.lower()
-        detected_emotions = {}
+        if text_lower is None:
+            text_lower = text.lower()
+        scores = {}
         found_keywords = []
         
-        # Analyze emotions based on keywords
-        for emotion, keywords in self.emotion_keywords.items():
-            score = 0
-            emotion_keywords = []
-            
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Check for intensity modifiers
-                    intensity = 1.0
-                    for modifier, multiplier in self.intensity_modifiers.items():
-                        if modifier in text_lower and keyword in text_lower:
-                            intensity = multiplier
-                            break
-                    
-                    score += intensity
-                    emotion_keywords.append(keyword)
+        # Analyze emotions based on keywords; a modifier only scales the
+        # keyword right after it ("very excited"), and each keyword counts once
+        intensity = 1.0
+        modifier_end = -1
+        for match in self._phrase_re.finditer(text_lower):
+            phrase = match.group(0)
+            kind, value = self._phrase_kinds[phrase]
+            if kind == 'modifier':
+                intensity = value
+                modifier_end = match.end()
+                continue
             
-            if score > 0:
-                detected_emotions[emotion] = score
-                found_keywords.extend(emotion_keywords)
+            if phrase not in found_keywords:
+                adjacent = modifier_end >= 0 and not text_lower[modifier_end:match.start()].strip()
+                scores[value] = scores.get(value, 0) + (intensity if adjacent else 1.0)
+                found_keywords.append(phrase)
+            intensity = 1.0
+            modifier_end = -1
+        
+        # Keep category order so ties resolve as before
+        detected_emotions = {
+            emotion: scores[emotion] for emotion in self.emotion_keywords if emotion in scores
+        }
         
         # Determine primary emotion
         if detected_emotions:
@@ -105,40 +184,28 @@ class AdvancedSentimentAnalyzer:
     
     def analyze_with_textblob(self, text: str) -> Optional[SentimentResult]:
         """Enhanced sentiment analysis using TextBlob (if available)."""
-        try:
-            from textblob import TextBlob
-            
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-            
-            # Map polarity to emotion
-            if polarity > 0.3:
-                emotion = 'positive'
-            elif polarity < -0.3:
-                emotion = 'negative'
-            elif polarity > 0.1:
-                emotion = 'confident'
-            elif polarity < -0.1:
-                emotion = 'nervous'
-            else:
-                emotion = 'neutral'
-            
-            confidence = abs(polarity) + 0.3
-            
-            return SentimentResult(
-                polarity=polarity,
-                subjectivity=subjectivity,
-                emotion=emotion,
-                confidence=min(confidence, 1.0),
-                keywords=[],
-                timestamp=datetime.now()
-            )
-            
-        except ImportError:
+        if TextBlob is None:
             return None
+        
+        blob = TextBlob(text)
+        polarity = blob.sentiment.polarity
+        subjectivity = blob.sentiment.subjectivity
+        
+        # Map polarity to emotion
+        emotion = _POLARITY_EMOTIONS[bisect_right(_POLARITY_BOUNDS, polarity)]
+        
+        confidence = abs(polarity) + 0.3
+        
+        return SentimentResult(
+            polarity=polarity,
+            subjectivity=subjectivity,
+            emotion=emotion,
+            confidence=min(confidence, 1.0),
+            keywords=[],
+            timestamp=datetime.now()
+        )
     
-    def analyze_sentiment(self, text: str) -> SentimentResult:
+    def analyze_sentiment(self, text: str, text_lower: Optional[str] = None) -> SentimentResult:
         """Main sentiment analysis method with fallback."""
         # Try advanced analysis first
         advanced_result = self.analyze_with_textblob(text)
@@ -146,20 +213,11 @@ class AdvancedSentimentAnalyzer:
             return advanced_result
         
         # Fallback to basic analysis
-        return self.analyze_text_basic(text)
+        return self.analyze_text_basic(text, text_lower)
     
     def get_emotion_emoji(self, emotion: str) -> str:
         """Get emoji representation of emotion."""
-        emoji_map = {
-            'excited': '🤩',
-            'confident': '😊',
-            'nervous': '😰',
-            'frustrated': '😤',
-            'positive': '😄',
-            'negative': '😞',
-            'neutral': '😐'
-        }
-        return emoji_map.get(emotion, '😐')
+        return _EMOTION_EMOJIS[_EMOTION_CODES.get(emotion, _NEUTRAL_CODE)]
     
     def get_encouragement_message(self, sentiment: SentimentResult) -> str:
         """Generate encouraging response based on sentiment."""
@@ -176,17 +234,21 @@ class AdvancedSentimentAnalyzer:
         else:
             return "Thank you for your thoughtful response."
     
-    def analyze_conversation_trend(self, sentiments: List[SentimentResult]) -> Dict:
-        """Analyze sentiment trends throughout the conversation."""
+    def analyze_conversation_trend(self, sentiments) -> Dict:
+        """Analyze sentiment trends throughout the conversation (a SentimentHistory or list of results)."""
         if not sentiments:
             return {'trend': 'neutral', 'average_polarity': 0.0, 'stability': 1.0}
         
-        polarities = [s.polarity for s in sentiments]
-        emotions = [s.emotion for s in sentiments]
+        if isinstance(sentiments, SentimentHistory):
+            polarities = sentiments.polarities
+            emotion_counts = sentiments.emotion_counts()
+        else:
+            polarities = np.fromiter((s.polarity for s in sentiments), dtype=np.float64, count=len(sentiments))
+            emotion_counts = dict(Counter(s.emotion for s in sentiments))
         
         # Calculate trend
         if len(polarities) > 1:
-            trend_slope = (polarities[-1] - polarities[0]) / len(polarities)
+            trend_slope = float(polarities[-1] - polarities[0]) / len(polarities)
             if trend_slope > 0.1:
                 trend = 'improving'
             elif trend_slope < -0.1:
@@ -196,17 +258,15 @@ class AdvancedSentimentAnalyzer:
         else:
             trend = 'neutral'
         
-        # Calculate stability (variance)
-        avg_polarity = sum(polarities) / len(polarities)
-        variance = sum((p - avg_polarity) ** 2 for p in polarities) / len(polarities)
+        # Calculate stability (variance); the mean is reused rather than
+        # recomputed inside var(), and the squared deviations are one dot product
+        avg_polarity = float(polarities.mean())
+        deviations = polarities - avg_polarity
+        variance = float(deviations @ deviations) / len(polarities)
         stability = max(0.0, 1.0 - variance)
         
-        # Most common emotion
-        emotion_counts = {}
-        for emotion in emotions:
-            emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
-        
-        dominant_emotion = max(emotion_counts, key=emotion_counts.get) if emotion_counts else 'neutral'
+        # Most common emotion (first seen wins a tie)
+        dominant_emotion = max(emotion_counts, key=emotion_counts.get)
         
         return {
             'trend': trend,
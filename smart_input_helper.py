@@ -3,6 +3,7 @@ Smart Input Helper for TalentScout
 Provides intelligent suggestions and validation for user inputs
 """
 
+from itertools import islice
 import streamlit as st
 from typing import List, Dict, Optional
 
@@ -44,6 +45,13 @@ class SmartInputHelper:
             'Boston, MA', 'Chicago, IL', 'Los Angeles, CA', 'Denver, CO', 'Atlanta, GA',
             'London, UK', 'Berlin, Germany', 'Toronto, Canada', 'Sydney, Australia'
         ]
+        
+        # (display, lowercase) pairs so matching doesn't lowercase every entry per keystroke
+        self._tech_lc = tuple(
+            (tech, tech.lower()) for techs in self.tech_suggestions.values() for tech in techs
+        )
+        self._positions_lc = tuple((pos, pos.lower()) for pos in self.position_suggestions)
+        self._locations_lc = tuple((loc, loc.lower()) for loc in self.location_suggestions)
     
     def create_smart_input(self, label: str, input_type: str, placeholder: str = "", help_text: str = ""):
         """Create a smart input field with suggestions."""
@@ -72,13 +80,13 @@ class SmartInputHelper:
         last_tech = current_techs[-1].lower() if current_techs else ""
         
         if len(last_tech) >= 2:
-            suggestions = []
-            
-            # Find matching suggestions from all categories
-            for category, techs in self.tech_suggestions.items():
-                for tech in techs:
-                    if last_tech in tech.lower() and tech not in current_techs:
-                        suggestions.append(tech)
+            # Find matching suggestions from all categories; only the first 4 are shown
+            already_listed = set(current_techs)
+            suggestions = list(islice(
+                (tech for tech, tech_lc in self._tech_lc
+                 if last_tech in tech_lc and tech not in already_listed),
+                4
+            ))
             
             if suggestions:
                 st.markdown("💡 **Suggestions:**")
@@ -94,10 +102,8 @@ class SmartInputHelper:
     def _show_position_suggestions(self, current_input: str):
         """Show position suggestions."""
         if len(current_input) >= 2:
-            suggestions = [
-                pos for pos in self.position_suggestions 
-                if current_input.lower() in pos.lower()
-            ]
+            needle = current_input.lower()
+            suggestions = list(islice((pos for pos, pos_lc in self._positions_lc if needle in pos_lc), 3))
             
             if suggestions:
                 st.markdown("💡 **Popular Positions:**")
@@ -111,10 +117,8 @@ class SmartInputHelper:
     def _show_location_suggestions(self, current_input: str):
         """Show location suggestions."""
         if len(current_input) >= 2:
-            suggestions = [
-                loc for loc in self.location_suggestions 
-                if current_input.lower() in loc.lower()
-            ]
+            needle = current_input.lower()
+            suggestions = list(islice((loc for loc, loc_lc in self._locations_lc if needle in loc_lc), 3))
             
             if suggestions:
                 st.markdown("💡 **Popular Locations:**")
@@ -1,18 +1,26 @@
-import re
+import hashlib
+import json
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 import openai
 import streamlit as st
 from config import (
     OPENAI_API_KEY,
+    REDIS_URL,
+    LLM_CACHE_TTL_SECONDS,
     MODEL_NAME,
-    EMAIL_PATTERN,
-    PHONE_PATTERN,
-    TECH_ASSESSMENT_PROMPT,
+    EMAIL_RE,
+    PHONE_RE,
+    OFF_TOPIC_RE,
+    INAPPROPRIATE_RE,
+    TECH_TOKEN_RE,
     EXIT_KEYWORDS,
-    SYSTEM_PROMPT,
+    STAGE_INPUT_DESCRIPTIONS,
     TEMPERATURE,
     MAX_TOKENS,
-    FALLBACK_QUESTIONS
+    load_strings,
+    get_fallback_index,
+    Stage
 )
 
 # Initialize OpenAI client with Python 3.13 compatibility
@@ -34,17 +42,29 @@ except Exception as e:
     print("Using fallback questions only.")
     client = None
 
+# Optional Redis backend so cached LLM results are shared across replicas
+try:
+    import redis
+    redis_client = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+except ImportError:
+    redis_client = None
+except Exception as e:
+    print(f"Failed to initialize Redis cache: {e}")
+    redis_client = None
+
 def validate_email(email: str) -> bool:
     """Validate email format."""
-    return bool(re.match(EMAIL_PATTERN, email))
+    return EMAIL_RE.match(email) is not None
 
 def validate_phone(phone: str) -> bool:
     """Validate phone number format."""
-    return bool(re.match(PHONE_PATTERN, phone))
+    return PHONE_RE.match(phone) is not None
 
-def is_exit_command(text: str) -> bool:
+def is_exit_command(text: str, text_lower: Optional[str] = None) -> bool:
     """Check if the user wants to exit the conversation."""
-    return text.lower().strip() in EXIT_KEYWORDS
+    if text_lower is None:
+        text_lower = text.lower()
+    return text_lower.strip() in EXIT_KEYWORDS
 
 def validate_experience(experience: str) -> Tuple[bool, Optional[float]]:
     """Validate years of experience."""
@@ -54,47 +74,123 @@ def validate_experience(experience: str) -> Tuple[bool, Optional[float]]:
     except ValueError:
         return False, None
 
-def generate_technical_questions(tech_stack: List[str]) -> List[str]:
-    """Generate technical questions based on the candidate's tech stack with error handling."""
+# Fixed arguments for every question-generation request
+_COMPLETION_KWARGS = {
+    'model': MODEL_NAME,
+    'temperature': TEMPERATURE,
+    'max_tokens': MAX_TOKENS,
+    'stream': True
+}
+
+@lru_cache(maxsize=None)
+def _system_message() -> dict:
+    """The system prompt message, built once from the strings resource."""
+    return {"role": "system", "content": load_strings()['SYSTEM_PROMPT']}
+
+def _valid_questions(lines: List[str]) -> List[str]:
+    """Keep the lines of a completion that look like technical questions."""
+    # One pass; the cheap length and '?' checks run before the per-character scan
+    return [
+        q for q in map(str.strip, lines)
+        if len(q) > 10 and '?' in q and any(char.isalpha() for char in q)
+    ]
+
+def _generate_questions_from_model(tech_stack: List[str]) -> Optional[List[str]]:
+    """Ask the model for technical questions; None when it is unavailable or gave nothing usable."""
     if not client:
-        return get_fallback_questions(tech_stack)
+        return None
 
     try:
-        prompt = TECH_ASSESSMENT_PROMPT.format(tech_stack=", ".join(tech_stack))
+        prompt = load_strings()['TECH_ASSESSMENT_PROMPT'].format(tech_stack=", ".join(tech_stack))
 
         response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=TEMPERATURE,
-            max_tokens=MAX_TOKENS
+            messages=[_system_message(), {"role": "user", "content": prompt}],
+            **_COMPLETION_KWARGS
         )
 
-        content = response.choices[0].message.content
-        questions = [q.strip() for q in content.split('\n') if q.strip() and any(char.isalpha() for char in q)]
-
-        # Filter out empty or invalid questions
+        # Validate each line as soon as it is complete instead of waiting for the whole reply
         valid_questions = []
-        for q in questions:
-            if len(q) > 10 and '?' in q:  # Basic validation
-                valid_questions.append(q)
-
-        return valid_questions if valid_questions else get_fallback_questions(tech_stack)
+        pending = ''
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            pending += delta
+            if '\n' in delta:
+                *lines, pending = pending.split('\n')
+                valid_questions.extend(_valid_questions(lines))
+        valid_questions.extend(_valid_questions([pending]))
+
+        return valid_questions or None
 
     except Exception as e:
         st.error(f"Error generating technical questions: {e}")
+        return None
+
+def generate_technical_questions(tech_stack: List[str]) -> List[str]:
+    """Generate technical questions based on the candidate's tech stack with error handling."""
+    return _generate_questions_from_model(tech_stack) or get_fallback_questions(tech_stack)
+
+def tech_stack_cache_key(tech_stack: List[str]) -> Tuple[str, ...]:
+    """Normalize a tech stack so ordering and case don't fragment the cache."""
+    return tuple(sorted({tech.lower().strip() for tech in tech_stack}))
+
+class _NoModelQuestions(Exception):
+    """Raised inside the cached generator so fallback questions are never cached."""
+
+@st.cache_data(max_entries=2048, persist="disk", show_spinner=False)
+def _model_questions_cached(tech_key: Tuple[str, ...], _tech_stack: List[str]) -> List[str]:
+    """Model-generated questions cached on disk by normalized key; _tech_stack is not hashed."""
+    key = None
+    if redis_client:
+        key = "tq:" + hashlib.blake2b(json.dumps(tech_key).encode(), digest_size=16).hexdigest()
+        try:
+            cached = redis_client.get(key)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            print(f"Redis cache read failed: {e}")
+
+    questions = _generate_questions_from_model(_tech_stack)
+    if questions is None:
+        raise _NoModelQuestions
+
+    # Only model output is shared with other replicas
+    if key is not None:
+        try:
+            redis_client.setex(key, LLM_CACHE_TTL_SECONDS, json.dumps(questions))
+        except Exception as e:
+            print(f"Redis cache write failed: {e}")
+    return questions
+
+def generate_technical_questions_cached(tech_stack: List[str]) -> List[str]:
+    """Generate technical questions, caching model output by the normalized tech stack.
+
+    The normalized key is only used for lookup; prompts and fallbacks see the
+    stack as the candidate typed it. Fallback questions are never cached, so a
+    missing API key or an outage doesn't pin them once the model is back.
+    """
+    # Common stacks are fully covered by the fallback bank - skip the API call
+    fallback_index = get_fallback_index()
+    if all(tech.lower().strip() in fallback_index for tech in tech_stack):
+        return get_fallback_questions(tech_stack)
+
+    try:
+        return _model_questions_cached(tech_stack_cache_key(tech_stack), list(tech_stack))
+    except _NoModelQuestions:
         return get_fallback_questions(tech_stack)
 
 def get_fallback_questions(tech_stack: List[str]) -> List[str]:
     """Provide fallback questions when AI generation fails."""
     fallback_questions = []
+    fallback_index = get_fallback_index()
 
     for tech in tech_stack[:3]:  # Limit to first 3 technologies
-        tech_lower = tech.lower()
-        if tech_lower in FALLBACK_QUESTIONS:
-            fallback_questions.extend(FALLBACK_QUESTIONS[tech_lower][:2])  # 2 questions per tech
+        questions = fallback_index.get(tech.lower())
+        if questions:
+            fallback_questions.extend(questions[:2])  # 2 questions per tech
 
     # Add generic questions if no specific ones found
     if not fallback_questions:
@@ -109,15 +205,18 @@ def get_fallback_questions(tech_stack: List[str]) -> List[str]:
 
 def format_candidate_summary(candidate_info: Dict) -> str:
     """Format candidate information for final summary."""
-    summary = """
+    get = candidate_info.get
+    tech_stack = ", ".join(get('tech_stack', []))
+    technical_questions = "\n".join(get('technical_questions', []))
+    return f"""
 📋 Candidate Summary:
 ------------------------
-Full Name: {name}
-Email: {email}
-Phone: {phone}
-Experience: {experience} years
-Desired Position: {position}
-Location: {location}
+Full Name: {get('name', 'N/A')}
+Email: {get('email', 'N/A')}
+Phone: {get('phone', 'N/A')}
+Experience: {get('experience', 'N/A')} years
+Desired Position: {get('position', 'N/A')}
+Location: {get('location', 'N/A')}
 Tech Stack: {tech_stack}
 
 🔍 Technical Assessment:
@@ -125,45 +224,29 @@ Tech Stack: {tech_stack}
 {technical_questions}
 
 Thank you for completing the initial screening! Our team will review your information and get back to you soon.
-    """.format(
-        name=candidate_info.get('name', 'N/A'),
-        email=candidate_info.get('email', 'N/A'),
-        phone=candidate_info.get('phone', 'N/A'),
-        experience=candidate_info.get('experience', 'N/A'),
-        position=candidate_info.get('position', 'N/A'),
-        location=candidate_info.get('location', 'N/A'),
-        tech_stack=", ".join(candidate_info.get('tech_stack', [])),
-        technical_questions="\n".join(candidate_info.get('technical_questions', []))
-    )
-    return summary
+    """
 
 def parse_tech_stack(tech_input: str) -> List[str]:
     """Parse and clean the tech stack input with enhanced validation."""
     if not tech_input or not tech_input.strip():
         return []
 
-    # Handle multiple separators
-    separators = [',', ';', '|', '\n']
-    for sep in separators:
-        if sep in tech_input:
-            tech_input = tech_input.replace(sep, ',')
-
-    # Split and clean
-    techs = [t.strip().title() for t in tech_input.split(',')]
-
-    # Filter out empty strings and very short entries
-    valid_techs = [t for t in techs if t and len(t) > 1]
-
-    # Remove duplicates while preserving order
+    # Walk the entries lazily, clean, drop very short ones and dedupe in one pass;
+    # a huge pasted list is only scanned as far as the tenth unique entry
     seen = set()
     unique_techs = []
-    for tech in valid_techs:
+    for match in TECH_TOKEN_RE.finditer(tech_input):
+        tech = match.group().strip().title()
+        if len(tech) <= 1:
+            continue
         tech_lower = tech.lower()
         if tech_lower not in seen:
             seen.add(tech_lower)
             unique_techs.append(tech)
+            if len(unique_techs) == 10:  # Limit to 10 technologies
+                break
 
-    return unique_techs[:10]  # Limit to 10 technologies
+    return unique_techs
 
 def export_candidate_data(candidate_info: Dict, format_type: str = "json") -> str:
     """Export candidate data to specified format using secure data handler."""
@@ -184,45 +267,27 @@ def export_candidate_data(candidate_info: Dict, format_type: str = "json") -> st
 
 def validate_conversation_context(user_input: str, current_stage: int) -> Tuple[bool, str]:
     """Validate if user input is appropriate for current conversation stage."""
-    user_input_lower = user_input.lower().strip()
-
     # Check for off-topic inputs
-    off_topic_keywords = [
-        'weather', 'sports', 'politics', 'food', 'movie', 'music',
-        'game', 'celebrity', 'news', 'joke', 'story'
-    ]
-
-    if any(keyword in user_input_lower for keyword in off_topic_keywords):
+    if OFF_TOPIC_RE.search(user_input):
         return False, "I'm here to help with your job application. Let's focus on gathering your professional information."
 
     # Check for inappropriate content
-    inappropriate_keywords = ['hate', 'violence', 'illegal', 'drugs']
-    if any(keyword in user_input_lower for keyword in inappropriate_keywords):
+    if INAPPROPRIATE_RE.search(user_input):
         return False, "Please keep our conversation professional and appropriate."
 
     # Stage-specific validation
-    if current_stage == 1 and '@' not in user_input and len(user_input) > 5:  # Email stage
+    if current_stage == Stage.EMAIL and '@' not in user_input and len(user_input) > 5:
         return False, "Please provide a valid email address with @ symbol."
 
     return True, ""
 
 def handle_unexpected_input(user_input: str, current_stage: int) -> str:
     """Handle unexpected or unclear user inputs with helpful responses."""
-    stage_names = {
-        0: "your name",
-        1: "your email address",
-        2: "your phone number",
-        3: "your years of experience",
-        4: "your desired position",
-        5: "your location",
-        6: "your technical skills"
-    }
-
     # Log the unexpected input for debugging
     if len(user_input.strip()) == 0:
         return "Please provide a response. I'm waiting for your input."
 
-    if current_stage in stage_names:
-        return f"I didn't quite understand '{user_input[:50]}...'. Could you please provide {stage_names[current_stage]}?"
+    if 0 <= current_stage < len(STAGE_INPUT_DESCRIPTIONS):
+        return f"I didn't quite understand '{user_input[:50]}...'. Could you please provide {STAGE_INPUT_DESCRIPTIONS[current_stage]}?"
 
     return f"I'm not sure I understand '{user_input[:50]}...'. Could you please rephrase your response?"
\ No newline at end of file